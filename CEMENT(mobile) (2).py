@@ -1,49 +1,70 @@
 
+import os
+import time
+
+# Taken before Kivy is imported; used to log the time to the first frame
+STARTUP_TIME = time.perf_counter()
+
 from kivy.app import App
+from kivy.clock import Clock
+from kivy.graphics import Color, Rectangle
+from kivy.logger import Logger
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.spinner import Spinner
 from kivy.uix.textinput import TextInput
 from kivy.uix.button import Button
-from kivy.uix.popup import Popup
-from kivy.uix.label import Label
 from kivy.utils import get_color_from_hex
 
+from beton import MixError, cached_mix, cement_types, concrete_types
+from beton import instrumentation
+from beton.instrumentation import timed
+from beton.popups import PopupPool
+from beton.quantity import (
+    AmbiguousQuantity, QuantityError, input_filter as quantity_input_filter, parse_quantity,
+)
+from beton.tasks import TaskScheduler
+
+# Optional mix catalogue shipped next to the app (see beton/catalogue.py)
+CATALOGUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mix_catalogue.bin')
+CATALOGUE_POLL_INTERVAL = 2  # seconds between checks for an updated catalogue
+HISTORY_FILE = 'history.sqlite3'  # calculation history, in the app data directory
+
+# The calculation itself runs on a task worker, so calculate_mixture only
+# times parsing the amount and queuing it; this records the worker's share.
+calculate_on_worker = timed('cached_mix')(cached_mix)
+
+# Lazy startup shows the first frame before loading the mix data and filling
+# the concrete dropdown; set BETON_EAGER_STARTUP=1 to build everything up front.
+LAZY_STARTUP = os.environ.get('BETON_EAGER_STARTUP') != '1'
+
+# Opt-in profiling (see beton/instrumentation.py): BETON_PROFILE=1 times the
+# hot paths and appends snapshots to a log every PROFILE_LOG_INTERVAL seconds.
+PROFILE_LOG_INTERVAL = 10
+if instrumentation.enabled:
+    instrumentation.count_widget_allocations()
+
 # Color scheme
 BACKGROUND_COLOR = get_color_from_hex("#242121")  # Dark background
 PRIMARY_COLOR = get_color_from_hex("#09192E")  # Dark primary color
 ACCENT_COLOR = get_color_from_hex("#64B5F6")  # Light blue accent
 TEXT_COLOR = get_color_from_hex("#f5f5f5")  # Light text color
 INPUT_COLOR = get_color_from_hex("#060708")  # Input text color
-beton_karisimlari = {
-    "C5": {
-        "Karışım Oranları": {
-            "CEM 1": {"Çimento": 160, "Su": 200, "Kum": 900, "Çakıl": 1100},
-            "CEM 2": {"Çimento": 150, "Su": 195, "Kum": 920, "Çakıl": 1080},
-            "CEM 3": {"Çimento": 155, "Su": 198, "Kum": 910, "Çakıl": 1090},
-        }
-    },
-    "C10": {
-        "Karışım Oranları": {
-            "CEM 1": {"Çimento": 200, "Su": 190, "Kum": 850, "Çakıl": 1150},
-            "CEM 2": {"Çimento": 190, "Su": 185, "Kum": 870, "Çakıl": 1130},
-            "CEM 3": {"Çimento": 195, "Su": 188, "Kum": 860, "Çakıl": 1140},
-        }
-    },
-    "C15": {
-        "Karışım Oranları": {
-            "CEM 1": {"Çimento": 230, "Su": 180, "Kum": 820, "Çakıl": 1180},
-            "CEM 2": {"Çimento": 220, "Su": 175, "Kum": 840, "Çakıl": 1160},
-            "CEM 3": {"Çimento": 225, "Su": 178, "Kum": 830, "Çakıl": 1170},
-        }
-    },
-    # Further concrete types up to C80 should be added here...
-}
 
 
 class ConcreteApp(App):
+    @timed('build')
     def build(self):
+        self.popups = PopupPool(TEXT_COLOR, scrollable=True)
+        self.tasks = TaskScheduler()
+        self.catalogue_watcher = None
+        self.catalogue_poll = None
+        self.history = None
+        self.data_task = None
+        if not LAZY_STARTUP:
+            self.load_mix_data()
+
         root = BoxLayout(orientation='vertical')
 
         # Main layout with padding and spacing
@@ -51,7 +72,6 @@ class ConcreteApp(App):
 
         # Setting the background color
         with layout.canvas.before:
-            from kivy.graphics import Color, Rectangle
             Color(*BACKGROUND_COLOR)
             self.rect = Rectangle(size=layout.size, pos=layout.pos)
             layout.bind(size=self._update_rect, pos=self._update_rect)
@@ -62,7 +82,10 @@ class ConcreteApp(App):
         scroll_layout.bind(minimum_height=scroll_layout.setter('height'))
 
         # Widgets with increased sizes and text sizes for mobile
-        self.concrete_spinner = self.create_spinner('Beton Türünü Seçiniz', [key for key in beton_karisimlari.keys()])
+        self.concrete_spinner = self.create_spinner('Beton Türünü Seçiniz', [] if LAZY_STARTUP else concrete_types())
+        if LAZY_STARTUP:
+            # The dropdown options are built when the spinner is first pressed
+            self.concrete_spinner.bind(on_press=self.load_concrete_values)
         self.cement_spinner = self.create_spinner('Çimento Türünü Seçiniz', [])
         self.amount_input = self.create_amount_input()
         calc_button = self.create_calculate_button()
@@ -81,8 +104,91 @@ class ConcreteApp(App):
 
         root.add_widget(layout)
 
+        if instrumentation.enabled:
+            self.start_profiling(root)
+
         return root
 
+    def start_profiling(self, root):
+        """Write instrumentation snapshots to the log and, if asked, show the overlay."""
+        self.profile_log = instrumentation.log_path(lambda: self.user_data_dir)
+        Clock.schedule_interval(lambda dt: instrumentation.metrics.write_log(self.profile_log), PROFILE_LOG_INTERVAL)
+        if instrumentation.overlay_enabled:
+            from beton.overlay import DebugOverlay
+            root.add_widget(DebugOverlay())
+
+    def on_stop(self):
+        self.tasks.shutdown()
+        if self.history is not None:
+            self.history.close()
+            self.history = None
+        if instrumentation.enabled:
+            instrumentation.metrics.write_log(self.profile_log)
+
+    def on_start(self):
+        from kivy.core.window import Window
+        Window.bind(on_flip=self.on_first_frame)
+
+    def on_first_frame(self, window):
+        """Log the startup time and load whatever lazy startup deferred."""
+        window.unbind(on_flip=self.on_first_frame)
+        Logger.info('ConcreteApp: first frame %.0f ms after start', (time.perf_counter() - STARTUP_TIME) * 1000)
+        if LAZY_STARTUP:
+            Clock.schedule_once(lambda dt: self.load_mix_data())
+
+    def load_mix_data(self):
+        """Open the calculation history and the mix catalogue on worker threads.
+
+        They are opened separately, so a damaged catalogue does not stop
+        calculations from being recorded.
+        """
+        if self.data_task is None:
+            self.data_task = self.tasks.submit(
+                self.open_catalogue, on_done=self.on_catalogue_open, on_error=self.on_catalogue_error
+            )
+            self.tasks.submit(self.open_history, on_done=self.on_history_open, on_error=self.on_history_error)
+
+    def open_history(self):
+        """Runs on a worker thread; must not touch widgets."""
+        from beton.history import HistoryStore
+        return HistoryStore(os.path.join(self.user_data_dir, HISTORY_FILE))
+
+    def on_history_open(self, history):
+        self.history = history
+
+    def on_history_error(self, exc):
+        Logger.error('ConcreteApp: calculation history unavailable: %s', exc)
+
+    def open_catalogue(self):
+        """Runs on a worker thread; must not touch widgets."""
+        if not os.path.exists(CATALOGUE_PATH):
+            return None
+        from beton.watcher import CatalogueWatcher
+        return CatalogueWatcher(CATALOGUE_PATH)
+
+    def on_catalogue_error(self, exc):
+        # The engine keeps the built-in table
+        Logger.error('ConcreteApp: mix catalogue not loaded, using the built-in table: %s', exc)
+
+    def on_catalogue_open(self, watcher):
+        self.catalogue_watcher = watcher
+        if self.catalogue_watcher is not None:
+            if self.concrete_spinner.values:
+                # Filled from the built-in table before the catalogue was open
+                self.concrete_spinner.values = concrete_types()
+            Clock.schedule_interval(self.poll_catalogue, CATALOGUE_POLL_INTERVAL)
+
+    def poll_catalogue(self, dt):
+        """Check the catalogue on a worker thread; only the spinner refresh runs here."""
+        if self.catalogue_poll is None or self.catalogue_poll.done():
+            self.catalogue_poll = self.tasks.submit(self.catalogue_watcher.poll, on_done=self.on_catalogue_change)
+
+    def load_concrete_values(self, spinner):
+        """Fill the concrete spinner when it is first pressed (lazy startup)."""
+        spinner.unbind(on_press=self.load_concrete_values)
+        self.load_mix_data()
+        spinner.values = concrete_types()
+
     def create_spinner(self, initial_text, values):
         """Create a Spinner widget optimized for mobile."""
         spinner = Spinner(
@@ -105,7 +211,8 @@ class ConcreteApp(App):
             height=120,
             font_size='20sp',
             background_color=TEXT_COLOR,
-            foreground_color=INPUT_COLOR
+            foreground_color=INPUT_COLOR,
+            input_filter=quantity_input_filter,
         )
         input_widget.bind(focus=self.on_focus)
         return input_widget
@@ -123,14 +230,32 @@ class ConcreteApp(App):
         button.bind(on_press=self.calculate_mixture)
         return button
 
+    @timed('update_cement_spinner')
     def update_cement_spinner(self, spinner, text):
         """Update the cement spinner options based on the selected concrete type."""
+        # A calculation still running was for the previous selection
+        self.tasks.cancel('calculation')
         selected_concrete = spinner.text
-        if selected_concrete in beton_karisimlari:
-            cement_types = list(beton_karisimlari[selected_concrete]["Karışım Oranları"].keys())
-            self.cement_spinner.values = cement_types
-            self.cement_spinner.text = 'Çimento Türünü Seçiniz'  # Reset spinner text
+        try:
+            self.cement_spinner.values = cement_types(selected_concrete)
+        except MixError:
+            return
+        self.cement_spinner.text = 'Çimento Türünü Seçiniz'  # Reset spinner text
+
+    def on_catalogue_change(self, changes):
+        """Refresh only the spinner lists touched by a catalogue reload."""
+        if not changes:
+            return
+        if changes.classes_changed:
+            self.concrete_spinner.values = concrete_types()
+        selected_concrete = self.concrete_spinner.text
+        if changes.rewritten or selected_concrete in changes.affected_classes:
+            try:
+                self.cement_spinner.values = cement_types(selected_concrete)
+            except MixError:
+                self.cement_spinner.values = []
 
+    @timed('calculate_mixture')
     def calculate_mixture(self, instance):
         """Calculate and display the mixture based on the selected values."""
         concrete_type = self.concrete_spinner.text
@@ -139,49 +264,44 @@ class ConcreteApp(App):
 
         # Validate input is a number
         try:
-            amount = float(amount)
-        except ValueError:
+            amount = parse_quantity(amount)
+        except AmbiguousQuantity:
+            self.show_error_popup("Miktar belirsiz: 1250 ya da 1,25 şeklinde giriniz.")
+            return
+        except QuantityError:
             self.show_error_popup("Lütfen geçerli bir miktar giriniz.")
             return
 
-        if concrete_type in beton_karisimlari:
-            if cement_type in beton_karisimlari[concrete_type]["Karışım Oranları"]:
-                mix = beton_karisimlari[concrete_type]["Karışım Oranları"][cement_type]
-                result = {ingredient: amount * quantity for ingredient, quantity in mix.items()}
-                self.show_result_popup(result)
-            else:
-                self.show_error_popup("Çimento türü bulunamadı.")
-        else:
-            self.show_error_popup("Beton türü bulunamadı.")
+        self.tasks.submit(
+            calculate_on_worker, concrete_type, cement_type, amount, key='calculation',
+            on_done=lambda result: self.on_mix_calculated(concrete_type, cement_type, amount, result),
+            on_error=self.on_mix_error,
+        )
+
+    def on_mix_calculated(self, concrete_type, cement_type, amount, result):
+        """Record and show a finished calculation."""
+        if self.history is not None:
+            self.history.record(concrete_type, cement_type, amount, result)
+        if instrumentation.enabled:
+            instrumentation.metrics.count('calculations')
+        self.show_result_popup(result)
 
+    def on_mix_error(self, exc):
+        if isinstance(exc, MixError):
+            self.show_error_popup(str(exc))
+            return
+        Logger.error('ConcreteApp: calculation failed', exc_info=exc)
+        self.show_error_popup("Hesaplama yapılamadı, lütfen tekrar deneyiniz.")
+
+    @timed('show_result_popup')
     def show_result_popup(self, result):
-        """Display the calculated mixture results in a scrollable popup."""
-        content = GridLayout(cols=1, padding=10, size_hint_y=None)
-        content.bind(minimum_height=content.setter('height'))
-        scroll = ScrollView(size_hint=(1, 1))
-        scroll.add_widget(content)
-
-        for ingredient, quantity in result.items():
-            content.add_widget(Label(text=f"{ingredient}: {quantity:.2f} kg", font_size='18sp', color=TEXT_COLOR))
-
-        popup = Popup(
-            title='Karışım Sonuçları',
-            content=scroll,
-            size_hint=(0.8, 0.8)
-        )
-        popup.open()
+        """Display the calculated mixture results in a popup (reused between calls)."""
+        self.popups.show_result(result)
 
+    @timed('show_error_popup')
     def show_error_popup(self, message):
-        """Display an error message in a popup."""
-        content = BoxLayout(orientation='vertical', padding=10)
-        content.add_widget(Label(text=message, font_size='18sp', color=TEXT_COLOR))
-
-        popup = Popup(
-            title='Hata',
-            content=content,
-            size_hint=(0.8, 0.4)
-        )
-        popup.open()
+        """Display an error message in a popup (reused between calls)."""
+        self.popups.show_error(message)
 
     def on_focus(self, instance, value):
         """Handle the focus event for the TextInput."""
@@ -0,0 +1,97 @@
+"""Count widget and memory allocations per calculation for result/error popups.
+
+Compares building popups on every call, as the apps used to, with reusing
+them through ``beton.popups.PopupPool``. Popups are built but not opened, so
+no window is needed::
+
+    python benchmarks/popup_allocations.py
+"""
+
+import os
+import sys
+import tracemalloc
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from kivy.uix.boxlayout import BoxLayout  # noqa: E402
+from kivy.uix.label import Label  # noqa: E402
+from kivy.uix.popup import Popup  # noqa: E402
+from kivy.uix.widget import Widget  # noqa: E402
+
+from beton import cached_mix  # noqa: E402
+from beton.popups import PopupPool  # noqa: E402
+
+TEXT_COLOR = (0.96, 0.96, 0.96, 1)
+QUERIES = [("C30", "CEM 1", 12.5), ("C25", "CEM 2", 8.0), ("C30", "CEM 1", 12.5), ("C40", "CEM 3", 3.0)]
+ROUNDS = 50
+
+
+def fresh_result_popup(result):
+    """Build a result popup the way show_result_popup did before pooling."""
+    content = BoxLayout(orientation='vertical', padding=10)
+    for ingredient, quantity in result.items():
+        content.add_widget(Label(text=f"{ingredient}: {quantity:.2f} kg", font_size='18sp', color=TEXT_COLOR))
+    return Popup(title='Karışım Sonuçları', content=content, size_hint=(0.8, 0.8))
+
+
+def fresh_error_popup(message):
+    """Build an error popup the way show_error_popup did before pooling."""
+    content = BoxLayout(orientation='vertical', padding=10)
+    content.add_widget(Label(text=message, font_size='18sp', color=TEXT_COLOR))
+    return Popup(title='Hata', content=content, size_hint=(0.8, 0.4))
+
+
+def count_widgets():
+    """Patch Widget.__init__ to count instances; returns the counter list."""
+    counter = [0]
+    original = Widget.__init__
+
+    def counting_init(self, **kwargs):
+        counter[0] += 1
+        original(self, **kwargs)
+
+    Widget.__init__ = counting_init
+    return counter
+
+
+def measure(show_result, show_error, counter):
+    """Return (widgets, memory blocks) allocated per calculation."""
+    # Warm up so one-time pool construction and caches are not counted.
+    for query in QUERIES:
+        show_result(cached_mix(*query))
+    show_error("Beton türü bulunamadı.")
+
+    calculations = ROUNDS * (len(QUERIES) + 1)
+    counter[0] = 0
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(ROUNDS):
+        for query in QUERIES:
+            show_result(cached_mix(*query))
+        show_error("Beton türü bulunamadı.")
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    return counter[0] / calculations, blocks / calculations
+
+
+def run():
+    counter = count_widgets()
+    pool = PopupPool(TEXT_COLOR)
+    return {
+        "fresh": measure(fresh_result_popup, fresh_error_popup, counter),
+        "pooled": measure(pool.result_popup, pool.error_popup, counter),
+    }
+
+
+def main():
+    results = run()
+    print(f"{'':8}{'widgets/calc':>14}{'mem blocks/calc':>18}")
+    for name, (widgets, blocks) in results.items():
+        print(f"{name:8}{widgets:14.2f}{blocks:18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Benchmark suite for the mix engine and the apps.
+
+Measures single-query latency, batch throughput, cold import time with and
+without Kivy, popup build time and (with ``--startup``) time to the first
+frame. Results are written as JSON, one file per commit, so runs can be
+compared::
+
+    python benchmarks/run.py                      # writes benchmarks/results/<commit>.json
+    python benchmarks/run.py --quick --startup --headless
+    python benchmarks/run.py --compare benchmarks/results/abc1234.json
+
+Kivy-dependent benchmarks are skipped when Kivy is not installed.
+``--headless`` runs Kivy with SDL's offscreen driver and the mock GL backend.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+APP = "cement(mobile).py"
+HAVE_KIVY = importlib.util.find_spec("kivy") is not None
+
+
+def _per_call_ns(statement, setup, number):
+    timer = timeit.Timer(statement, setup=setup, globals={})
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+def bench_lookup(quick):
+    """Single-query latency through the engine and the compatibility dict."""
+    number = 20000 if quick else 200000
+    setup = "import beton; from beton import beton_karisimlari; beton.cached_mix('C30', 'CEM 1', 2.0)"
+    return {
+        "dict_lookup_ns": _per_call_ns(
+            "mix = beton_karisimlari['C30']['Karışım Oranları']['CEM 1']; "
+            "{k: 2.0 * q for k, q in mix.items()}", setup, number),
+        "calculate_mix_ns": _per_call_ns("beton.calculate_mix('C30', 'CEM 1', 2.0)", setup, number),
+        "cached_mix_ns": _per_call_ns("beton.cached_mix('C30', 'CEM 1', 2.0)", setup, number),
+    }
+
+
+def bench_batch(quick):
+    """Batch throughput for 1k and 1M orders."""
+    from beton import concrete_types, get_table
+    from beton import batch
+
+    rng = random.Random(0)
+    classes = concrete_types()
+    cements = list(get_table().cement_types)
+    results = {"numpy": batch.np is not None}
+    for size in (1000, 100_000 if quick else 1_000_000):
+        concretes = [rng.choice(classes) for _ in range(size)]
+        cement = [rng.choice(cements) for _ in range(size)]
+        amounts = [rng.uniform(1, 12) for _ in range(size)]
+        runs = []
+        for _ in range(3):
+            start = time.perf_counter()
+            batch.calculate_batch(concretes, cement, amounts)
+            runs.append(time.perf_counter() - start)
+        results[f"orders_per_s_{size}"] = size / min(runs)
+    return results
+
+
+def _import_ms(code, env=None, runs=5):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", "import time; t = time.perf_counter()\n" + code
+             + "\nprint((time.perf_counter() - t) * 1000)"],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True, timeout=120,
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def _kivy_env(headless):
+    env = dict(os.environ, KIVY_NO_ARGS="1", KIVY_NO_CONSOLELOG="1")
+    if headless:
+        env.setdefault("SDL_VIDEODRIVER", "offscreen")
+        env.setdefault("KIVY_GL_BACKEND", "mock")
+    return env
+
+
+def bench_import(quick, headless):
+    """Cold import time of the engine alone and of the app module with Kivy."""
+    runs = 3 if quick else 7
+    results = {"beton_ms": _import_ms("import beton", runs=runs)}
+    if HAVE_KIVY:
+        results["app_module_ms"] = _import_ms(
+            f"import runpy; runpy.run_path({APP!r})", env=_kivy_env(headless), runs=runs
+        )
+    return results
+
+
+POPUP_CODE = r'''
+import json, timeit
+from beton import cached_mix
+from beton.popups import PopupPool
+from popup_allocations import TEXT_COLOR, fresh_result_popup
+results = [cached_mix("C30", "CEM 1", 2.0), cached_mix("C25", "CEM 2", 8.0)]
+pool = PopupPool(TEXT_COLOR)
+state = {"i": 0}
+def pooled():
+    state["i"] ^= 1
+    pool.result_popup(results[state["i"]])
+def fresh():
+    fresh_result_popup(results[0])
+pooled()
+print(json.dumps({
+    "fresh_build_us": min(timeit.repeat(fresh, number=NUMBER, repeat=3)) / NUMBER * 1e6,
+    "pooled_update_us": min(timeit.repeat(pooled, number=NUMBER, repeat=3)) / NUMBER * 1e6,
+}))
+'''
+
+
+def bench_popups(quick, headless):
+    """Result popup build time, fresh versus pooled, in a Kivy subprocess."""
+    code = POPUP_CODE.replace("NUMBER", "50" if quick else "500")
+    output = subprocess.run(
+        [sys.executable, "-c", f"import sys; sys.path[:0] = [{ROOT!r}, {HERE!r}]\n" + code],
+        cwd=ROOT, env=_kivy_env(headless), capture_output=True, text=True, check=True, timeout=300,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def bench_startup(quick, headless):
+    """Time to the first frame, lazy versus eager startup."""
+    import startup
+
+    return startup.measure(APP, runs=3 if quick else 5, headless=headless)
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(quick=False, startup=False, headless=False):
+    benchmarks = {
+        "lookup": lambda: bench_lookup(quick),
+        "batch": lambda: bench_batch(quick),
+        "import": lambda: bench_import(quick, headless),
+    }
+    if HAVE_KIVY:
+        benchmarks["popups"] = lambda: bench_popups(quick, headless)
+        if startup:
+            benchmarks["startup"] = lambda: bench_startup(quick, headless)
+    report = {
+        "commit": _commit(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "results": {},
+    }
+    for name, benchmark in benchmarks.items():
+        print(f"running {name}...", file=sys.stderr)
+        report["results"][name] = benchmark()
+    return report
+
+
+def _flatten(results):
+    return {
+        f"{group}.{key}": value
+        for group, values in results.items()
+        for key, value in _walk(values)
+    }
+
+
+def _walk(values, prefix=""):
+    for key, value in values.items():
+        if isinstance(value, dict):
+            yield from _walk(value, f"{prefix}{key}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield f"{prefix}{key}", value
+
+
+def print_report(report, baseline=None):
+    current = _flatten(report["results"])
+    previous = _flatten(baseline["results"]) if baseline else {}
+    for key, value in current.items():
+        line = f"{key:42}{value:16.2f}"
+        if key in previous and previous[key]:
+            line += f"{value / previous[key]:10.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations and 100k instead of 1M orders")
+    parser.add_argument("--startup", action="store_true", help="also measure time to first frame")
+    parser.add_argument("--headless", action="store_true", help="run Kivy without a display")
+    parser.add_argument("--output", help="JSON file to write (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to compare against (ratios new/old)")
+    args = parser.parse_args()
+
+    report = run(args.quick, args.startup, args.headless)
+    output = args.output or os.path.join(HERE, "results", f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    print(f"results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure app cold start with lazy and eager startup.
+
+Each run starts a fresh interpreter, runs the app until its first frame has
+been drawn, then presses the concrete spinner once (which is when lazy
+startup fills the dropdown) and exits. Reported times are medians::
+
+    python benchmarks/startup.py [--app "cement(mobile).py"] [--runs 5] [--headless]
+
+``--headless`` uses SDL's offscreen driver and Kivy's mock GL backend so the
+benchmark runs without a display.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+DRIVER = r'''
+import time
+t0 = time.perf_counter()
+import json, os, runpy, sys
+app_path = sys.argv[1]
+sys.path.insert(0, os.path.dirname(os.path.abspath(app_path)))
+namespace = runpy.run_path(app_path)
+timings = {}
+
+ConcreteApp = namespace["ConcreteApp"]
+app_first_frame = ConcreteApp.on_first_frame
+
+def on_first_frame(self, window):
+    app_first_frame(self, window)
+    timings["first_frame_ms"] = (time.perf_counter() - t0) * 1000
+    start = time.perf_counter()
+    self.concrete_spinner.dispatch("on_press")
+    timings["first_dropdown_ms"] = (time.perf_counter() - start) * 1000
+    self.stop()
+
+ConcreteApp.on_first_frame = on_first_frame
+ConcreteApp().run()
+print("TIMINGS " + json.dumps(timings), flush=True)
+'''
+
+
+def run_once(app, eager, headless):
+    env = dict(os.environ, KIVY_NO_ARGS="1", KIVY_NO_CONSOLELOG="1")
+    env.pop("BETON_EAGER_STARTUP", None)
+    if eager:
+        env["BETON_EAGER_STARTUP"] = "1"
+    if headless:
+        env.setdefault("SDL_VIDEODRIVER", "offscreen")
+        env.setdefault("KIVY_GL_BACKEND", "mock")
+    output = subprocess.run(
+        [sys.executable, "-c", DRIVER, app], env=env, cwd=ROOT,
+        capture_output=True, text=True, check=True, timeout=120,
+    ).stdout
+    for line in output.splitlines():
+        if line.startswith("TIMINGS "):
+            return json.loads(line[len("TIMINGS "):])
+    raise RuntimeError(f"no timings reported by {app}")
+
+
+def measure(app, runs=5, headless=False):
+    """Return ``{mode: {metric: median ms}}`` for lazy and eager startup."""
+    results = {}
+    for mode in ("eager", "lazy"):
+        samples = [run_once(app, mode == "eager", headless) for _ in range(runs)]
+        results[mode] = {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="cement(mobile).py")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--headless", action="store_true")
+    args = parser.parse_args()
+    results = measure(args.app, args.runs, args.headless)
+    print(f"{'':8}{'first frame ms':>16}{'first dropdown ms':>20}")
+    for mode, timings in results.items():
+        print(f"{mode:8}{timings['first_frame_ms']:16.1f}{timings['first_dropdown_ms']:20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Concrete mix calculation engine shared by the Kivy apps and headless tools.
+
+Importing ``beton`` does not import Kivy; only ``beton.popups``, which the
+apps use, does.
+"""
+
+from beton.engine import (
+    MIX_KEY,
+    MixError,
+    UnknownCementType,
+    UnknownConcreteType,
+    builtin_table,
+    cached_mix,
+    calculate_mix,
+    cement_types,
+    concrete_types,
+    get_table,
+    load_catalogue,
+    mix_ratios,
+    normalize_query,
+    result_cache,
+    set_table,
+)
+from beton.cache import LRUCache
+from beton.table import MixRow, MixTable
+
+__all__ = [
+    "MIX_KEY",
+    "LRUCache",
+    "MixError",
+    "MixRow",
+    "MixTable",
+    "UnknownCementType",
+    "UnknownConcreteType",
+    "beton_karisimlari",
+    "builtin_table",
+    "cached_mix",
+    "calculate_mix",
+    "cement_types",
+    "concrete_types",
+    "get_table",
+    "load_catalogue",
+    "mix_ratios",
+    "normalize_query",
+    "result_cache",
+    "set_table",
+]
+
+
+def __getattr__(name):
+    if name == "beton_karisimlari":
+        from beton import engine
+
+        return engine.beton_karisimlari
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,5 @@
+import sys
+
+from beton.cli import main
+
+sys.exit(main())
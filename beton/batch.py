@@ -0,0 +1,88 @@
+"""Batch mix calculation for many pour orders at once.
+
+The engine's :class:`~beton.table.MixTable` is already a dense
+classes × cement types × ingredients table, so a whole batch of orders is a
+single gather-and-multiply. NumPy is used when available; otherwise the same
+table is walked with plain index arithmetic.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+from beton.engine import get_table
+from beton.errors import UnknownCementType, UnknownConcreteType
+
+
+def _raise_missing(table, concrete, cement):
+    """Raise the engine error for an order that has no mix."""
+    if concrete not in table.concrete_ids:
+        raise UnknownConcreteType(concrete)
+    raise UnknownCementType(concrete, cement)
+
+
+def numpy_views(table):
+    """Return ``(values, present)`` NumPy views over the table's buffers; needs NumPy."""
+    views = getattr(table, "_numpy_views", None)
+    if views is None:
+        shape = (len(table.concrete_types), len(table.cement_types))
+        values = np.frombuffer(table.values, dtype=np.float64).reshape(shape + (len(table.ingredients),))
+        present = np.frombuffer(table.present, dtype=bool).reshape(shape)
+        views = table._numpy_views = (values, present)
+    return views
+
+
+def _ids_numpy(names, index):
+    # One dict probe per order is cheaper than np.unique's sort on strings.
+    get = index.get
+    return np.fromiter((get(name, -1) for name in names), dtype=np.intp, count=len(names))
+
+
+def _calculate_numpy(table, concrete_types, cement_types, amounts):
+    values, present = numpy_views(table)
+    if len(amounts) == 0:
+        return np.zeros((0, len(table.ingredients)))
+    c_ids = _ids_numpy(concrete_types, table.concrete_ids)
+    m_ids = _ids_numpy(cement_types, table.cement_ids)
+    valid = (c_ids >= 0) & (m_ids >= 0)
+    valid[valid] = present[c_ids[valid], m_ids[valid]]
+    if not valid.all():
+        row = int(np.argmin(valid))
+        _raise_missing(table, concrete_types[row], cement_types[row])
+    amounts = np.asarray(amounts, dtype=np.float64)
+    return values[c_ids, m_ids] * amounts[:, None]
+
+
+def _calculate_python(table, concrete_types, cement_types, amounts):
+    concrete_ids = table.concrete_ids
+    cement_ids = table.cement_ids
+    values = table.values
+    present = table.present
+    n_cements = len(table.cement_types)
+    n_ingredients = len(table.ingredients)
+    result = []
+    for concrete, cement, amount in zip(concrete_types, cement_types, amounts):
+        c = concrete_ids.get(concrete)
+        m = cement_ids.get(cement)
+        if c is None or m is None or not present[c * n_cements + m]:
+            _raise_missing(table, concrete, cement)
+        start = (c * n_cements + m) * n_ingredients
+        amount = float(amount)
+        result.append([amount * quantity for quantity in values[start:start + n_ingredients]])
+    return result
+
+
+def calculate_batch(concrete_types, cement_types, amounts, table=None):
+    """Return an orders × ingredients matrix of kg for the given orders.
+
+    Columns follow ``table.ingredients`` (the engine table by default). The
+    result is a NumPy array when NumPy is installed, otherwise a list of row
+    lists. Catalogue tables are decoded into a dense table on first use.
+    """
+    if not len(concrete_types) == len(cement_types) == len(amounts):
+        raise ValueError("concrete_types, cement_types and amounts must have the same length")
+    table = (table or get_table()).dense()
+    if np is None:
+        return _calculate_python(table, concrete_types, cement_types, amounts)
+    return _calculate_numpy(table, concrete_types, cement_types, amounts)
@@ -0,0 +1,58 @@
+"""Bounded least-recently-used cache with hit/miss counters."""
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Map keys to values, evicting the least recently used entry when full."""
+
+    def __init__(self, maxsize=256):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # Bumped by clear(); put() drops values computed before a clear
+        self.generation = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` and count a hit or a miss."""
+        # No lock: the lookup and move_to_end() are single C calls, so a hit
+        # costs a dict probe rather than a lock round trip. A key evicted
+        # between the two is reported as a miss.
+        try:
+            value = self._data[key]
+            self._data.move_to_end(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def put(self, key, value, generation=None):
+        """Store ``value``, unless ``generation`` was read before the last :meth:`clear`."""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries; the hit/miss counters are kept."""
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def info(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
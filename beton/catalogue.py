@@ -0,0 +1,462 @@
+"""On-disk, memory-mapped mix-design catalogue.
+
+A catalogue file holds any number of mix designs in a compact binary layout
+that is memory-mapped read-only and decoded lazily: opening a catalogue only
+reads the fixed-size header, names are decoded on first use and a design's
+amounts are unpacked only when that design is looked up. Several processes
+opening the same file share its pages through the OS page cache.
+
+Layout (little-endian)::
+
+    header   magic, n_classes, n_cements, n_ingredients, n_designs,
+             names offset, index offset, records offset
+    names    class, cement and ingredient names as u16 length + UTF-8
+    index    n_classes + 1 u32 record numbers; the designs of class ``c``
+             are records ``index[c]:index[c + 1]``
+    records  per design: u32 cement id, 4 pad bytes, n_ingredients float64,
+             sorted by (class id, cement id)
+
+Build a catalogue from CSV or JSON with::
+
+    python -m beton.catalogue build designs.bin designs.csv [more.json ...]
+
+CSV files need a header row ``concrete,cement,<ingredient>,...``. JSON files
+either use the nested ``beton_karisimlari`` layout or are a list of
+``{"concrete": ..., "cement": ..., "ingredients": {...}}`` objects. Without
+input files the built-in mix table is written.
+"""
+
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from beton.errors import UnknownCementType, UnknownConcreteType
+from beton.table import MIX_KEY, MixTable
+
+MAGIC = b"BTNCAT\x00\x01"
+_HEADER = struct.Struct("<8sIIIIQQQ")
+_NAME_LENGTH = struct.Struct("<H")
+_CEMENT_ID = struct.Struct("<I")
+
+
+class CatalogueError(ValueError):
+    """Raised when a catalogue file or import source is malformed."""
+
+
+class Catalogue:
+    """Read-only view of a catalogue file.
+
+    Provides the same lookup methods as :class:`~beton.table.MixTable`
+    (``concrete_types``, ``cements_for``, ``ids``, ``scale``), so the engine
+    can use either one.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._stat = os.fstat(f.fileno())
+            if self._stat.st_size < _HEADER.size:
+                raise CatalogueError(f"{path}: not a mix catalogue")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.n_classes, self.n_cements, self.n_ingredients, self.n_designs,
+         self._names_offset, self._index_offset, self._records_offset) = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self._map.close()
+            raise CatalogueError(f"{path}: not a mix catalogue")
+        self._record = struct.Struct(f"<I4x{self.n_ingredients}d")
+        # A file copied in non-atomically can be cut short; check that every
+        # section lies inside it before anything is read from the sections.
+        if not (
+            _HEADER.size <= self._names_offset <= self._index_offset
+            and self._index_offset + 4 * (self.n_classes + 1) <= self._records_offset
+            and self._records_offset + self.n_designs * self._record.size <= self._stat.st_size
+            and struct.unpack_from("<I", self._map, self._index_offset + 4 * self.n_classes)[0]
+            == self.n_designs
+        ):
+            self._map.close()
+            raise CatalogueError(f"{path}: truncated or corrupt mix catalogue")
+        self._amounts = struct.Struct(f"<{self.n_ingredients}d")
+        self._names = None
+        self._cements_by_class = {}
+        self._table = None
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _decode_names(self):
+        if self._names is None:
+            offset = self._names_offset
+            groups = []
+            for count in (self.n_classes, self.n_cements, self.n_ingredients):
+                names = []
+                for _ in range(count):
+                    (length,) = _NAME_LENGTH.unpack_from(self._map, offset)
+                    offset += _NAME_LENGTH.size
+                    names.append(sys.intern(self._map[offset:offset + length].decode("utf-8")))
+                    offset += length
+                groups.append(tuple(names))
+            concretes, cements, ingredients = groups
+            self._names = (
+                concretes, cements, ingredients,
+                {name: i for i, name in enumerate(concretes)},
+                {name: i for i, name in enumerate(cements)},
+            )
+        return self._names
+
+    @property
+    def concrete_types(self):
+        return self._decode_names()[0]
+
+    @property
+    def cement_types(self):
+        return self._decode_names()[1]
+
+    @property
+    def ingredients(self):
+        return self._decode_names()[2]
+
+    @property
+    def concrete_ids(self):
+        return self._decode_names()[3]
+
+    @property
+    def cement_ids(self):
+        return self._decode_names()[4]
+
+    def _class_range(self, concrete_id):
+        start, stop = struct.unpack_from("<II", self._map, self._index_offset + 4 * concrete_id)
+        return start, stop
+
+    def _record_offset(self, record):
+        return self._records_offset + record * self._record.size
+
+    def _cement_ids_of(self, concrete_id):
+        ids = self._cements_by_class.get(concrete_id)
+        if ids is None:
+            start, stop = self._class_range(concrete_id)
+            ids = self._cements_by_class[concrete_id] = [
+                _CEMENT_ID.unpack_from(self._map, self._record_offset(record))[0]
+                for record in range(start, stop)
+            ]
+        return ids
+
+    def _find(self, concrete_type, cement_type):
+        """Return the record number of a design, raising the engine errors."""
+        c = self.concrete_ids.get(concrete_type)
+        if c is None:
+            raise UnknownConcreteType(concrete_type)
+        m = self.cement_ids.get(cement_type)
+        if m is not None:
+            ids = self._cement_ids_of(c)
+            i = bisect_left(ids, m)
+            if i < len(ids) and ids[i] == m:
+                return self._class_range(c)[0] + i
+        raise UnknownCementType(concrete_type, cement_type)
+
+    def ids(self, concrete_type, cement_type):
+        """Resolve names to ``(concrete_id, cement_id)``, raising the engine errors."""
+        self._find(concrete_type, cement_type)
+        return self.concrete_ids[concrete_type], self.cement_ids[cement_type]
+
+    def cements_for(self, concrete_type):
+        """Return the cement types available for a class, in catalogue order."""
+        c = self.concrete_ids.get(concrete_type)
+        if c is None:
+            raise UnknownConcreteType(concrete_type)
+        cement_types = self.cement_types
+        return tuple(cement_types[m] for m in self._cement_ids_of(c))
+
+    def amounts(self, concrete_type, cement_type):
+        """Return the per-m³ amounts of a design in ``ingredients`` order."""
+        record = self._find(concrete_type, cement_type)
+        return self._amounts.unpack_from(self._map, self._record_offset(record) + 8)
+
+    def scale(self, concrete_type, cement_type, amount):
+        """Return kg per ingredient for ``amount`` m³ of the given design."""
+        amounts = self.amounts(concrete_type, cement_type)
+        return {ingredient: amount * q for ingredient, q in zip(self.ingredients, amounts)}
+
+    def designs(self):
+        """Yield ``(concrete, cement, amounts)`` for every design in file order."""
+        concretes, cements = self.concrete_types, self.cement_types
+        unpack = self._record.unpack_from
+        for c in range(self.n_classes):
+            start, stop = self._class_range(c)
+            for record in range(start, stop):
+                cement_id, *amounts = unpack(self._map, self._record_offset(record))
+                yield concretes[c], cements[cement_id], tuple(amounts)
+
+    def _class_bytes(self, concrete_id):
+        start, stop = self._class_range(concrete_id)
+        return self._map[self._record_offset(start):self._record_offset(stop)]
+
+    def _class_records(self, concrete_id):
+        """Return ``{cement_id: raw record bytes}`` for one class."""
+        start, _ = self._class_range(concrete_id)
+        size = self._record.size
+        offset = self._record_offset(start)
+        return {
+            cement_id: self._map[offset + i * size:offset + (i + 1) * size]
+            for i, cement_id in enumerate(self._cement_ids_of(concrete_id))
+        }
+
+    def diff(self, old):
+        """Return ``(added, removed, modified)`` sets of ``(class, cement)`` pairs since ``old``.
+
+        When both files share the same name tables the records are compared
+        as raw bytes class by class, skipping classes whose bytes are equal;
+        otherwise designs are decoded and compared by ingredient.
+        """
+        added, removed, modified = set(), set(), set()
+        if self._same_names(old):
+            concretes, cements = self.concrete_types, self.cement_types
+            for c in range(self.n_classes):
+                if self._class_bytes(c) == old._class_bytes(c):
+                    continue
+                new_rows, old_rows = self._class_records(c), old._class_records(c)
+                for m in new_rows.keys() - old_rows.keys():
+                    added.add((concretes[c], cements[m]))
+                for m in old_rows.keys() - new_rows.keys():
+                    removed.add((concretes[c], cements[m]))
+                for m in new_rows.keys() & old_rows.keys():
+                    if new_rows[m] != old_rows[m]:
+                        modified.add((concretes[c], cements[m]))
+        else:
+            def by_pair(catalogue):
+                ingredients = catalogue.ingredients
+                return {
+                    (concrete, cement): {k: v for k, v in zip(ingredients, amounts) if v}
+                    for concrete, cement, amounts in catalogue.designs()
+                }
+            new_designs, old_designs = by_pair(self), by_pair(old)
+            added = new_designs.keys() - old_designs.keys()
+            removed = old_designs.keys() - new_designs.keys()
+            modified = {
+                pair for pair in new_designs.keys() & old_designs.keys()
+                if new_designs[pair] != old_designs[pair]
+            }
+        return set(added), set(removed), modified
+
+    def _same_names(self, other):
+        return (
+            self._map[self._names_offset:self._index_offset]
+            == other._map[other._names_offset:other._index_offset]
+        )
+
+    def adopt(self, old, affected_classes):
+        """Reuse ``old``'s decoded state for every class not in ``affected_classes``.
+
+        Cement lists of unaffected classes are carried over, and if ``old``
+        had already been decoded into a dense table, a copy of it is patched
+        for the affected classes only instead of decoding every record.
+        """
+        if not self._same_names(old):
+            return
+        affected = {self.concrete_ids[name] for name in affected_classes}
+        for c, ids in old._cements_by_class.items():
+            if c not in affected:
+                self._cements_by_class[c] = ids
+        if old._table is None:
+            return
+        n_cements, n_ingredients = self.n_cements, self.n_ingredients
+        values = array("d", old._table.values)
+        present = bytearray(old._table.present)
+        unpack = self._record.unpack_from
+        for c in affected:
+            present[c * n_cements:(c + 1) * n_cements] = bytes(n_cements)
+            start, stop = self._class_range(c)
+            for record in range(start, stop):
+                cement_id, *amounts = unpack(self._map, self._record_offset(record))
+                pair = c * n_cements + cement_id
+                present[pair] = 1
+                values[pair * n_ingredients:(pair + 1) * n_ingredients] = array("d", amounts)
+        self._table = MixTable(self.concrete_types, self.cement_types, self.ingredients, values, present)
+
+    def dense(self):
+        """Decode the whole catalogue into a :class:`MixTable` (cached)."""
+        if self._table is None:
+            n_cements, n_ingredients = self.n_cements, self.n_ingredients
+            values = array("d", bytes(8 * self.n_classes * n_cements * n_ingredients))
+            present = bytearray(self.n_classes * n_cements)
+            unpack = self._record.unpack_from
+            for c in range(self.n_classes):
+                start, stop = self._class_range(c)
+                for record in range(start, stop):
+                    cement_id, *amounts = unpack(self._map, self._record_offset(record))
+                    pair = c * n_cements + cement_id
+                    present[pair] = 1
+                    values[pair * n_ingredients:(pair + 1) * n_ingredients] = array("d", amounts)
+            self._table = MixTable(self.concrete_types, self.cement_types, self.ingredients, values, present)
+        return self._table
+
+
+def write_catalogue(path, designs):
+    """Write ``(concrete, cement, {ingredient: kg})`` designs to a catalogue file.
+
+    Names keep their first-seen order; a later design for the same
+    class/cement pair replaces an earlier one. The file is written to a
+    temporary name and moved into place, so open readers keep their old
+    mapping.
+    """
+    concretes, cements, ingredients = {}, {}, {}
+    by_pair = {}
+    for concrete, cement, mix in designs:
+        c = concretes.setdefault(concrete, len(concretes))
+        m = cements.setdefault(cement, len(cements))
+        for ingredient in mix:
+            ingredients.setdefault(ingredient, len(ingredients))
+        by_pair[c, m] = mix
+
+    names = bytearray()
+    for group in (concretes, cements, ingredients):
+        for name in group:
+            encoded = name.encode("utf-8")
+            names += _NAME_LENGTH.pack(len(encoded)) + encoded
+    names += bytes(-len(names) % 8)
+
+    record = struct.Struct(f"<I4x{len(ingredients)}d")
+    index = array("I", [0] * (len(concretes) + 1))
+    records = bytearray()
+    ordered = sorted(by_pair)
+    for n, (c, m) in enumerate(ordered):
+        index[c + 1] = n + 1
+        mix = by_pair[c, m]
+        try:
+            records += record.pack(m, *(float(mix.get(name, 0)) for name in ingredients))
+        except (TypeError, ValueError):
+            raise CatalogueError(f"invalid amount in {list(concretes)[c]}/{list(cements)[m]}") from None
+    for c in range(1, len(index)):
+        index[c] = max(index[c], index[c - 1])
+    if sys.byteorder != "little":
+        index.byteswap()
+    index_bytes = index.tobytes() + bytes(-4 * len(index) % 8)
+
+    names_offset = _HEADER.size + (-_HEADER.size % 8)
+    index_offset = names_offset + len(names)
+    records_offset = index_offset + len(index_bytes)
+    header = _HEADER.pack(
+        MAGIC, len(concretes), len(cements), len(ingredients), len(ordered),
+        names_offset, index_offset, records_offset,
+    )
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header + bytes(names_offset - _HEADER.size))
+        f.write(names)
+        f.write(index_bytes)
+        f.write(records)
+    os.replace(tmp_path, path)
+
+
+def _number(value, source):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    try:
+        return float(value) if value.strip() else 0.0
+    except (AttributeError, ValueError):
+        raise CatalogueError(f"{source}: invalid amount {value!r}") from None
+
+
+def read_csv(path):
+    """Yield designs from a CSV file with a ``concrete,cement,<ingredient>...`` header."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header or len(header) < 3:
+            raise CatalogueError(f"{path}: expected a concrete,cement,<ingredient>... header")
+        ingredients = header[2:]
+        for line, row in enumerate(reader, start=2):
+            if not row:
+                continue
+            if len(row) != len(header):
+                raise CatalogueError(f"{path}:{line}: expected {len(header)} columns")
+            source = f"{path}:{line}"
+            yield row[0], row[1], {name: _number(value, source) for name, value in zip(ingredients, row[2:])}
+
+
+def read_json(path):
+    """Yield designs from a nested-table or list-of-designs JSON file."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    yield from iter_designs(data, path)
+
+
+def iter_designs(data, source="<data>"):
+    """Yield designs from a nested ``beton_karisimlari``-style dict or a list of records."""
+    if isinstance(data, dict):
+        for concrete, entry in data.items():
+            mixes = entry.get(MIX_KEY) if isinstance(entry, dict) else None
+            if not isinstance(mixes, dict):
+                raise CatalogueError(f"{source}: {concrete}: expected a {MIX_KEY!r} object")
+            for cement, mix in mixes.items():
+                yield _design(concrete, cement, mix, source)
+    elif isinstance(data, list):
+        for item in data:
+            try:
+                concrete, cement, mix = item["concrete"], item["cement"], item["ingredients"]
+            except (KeyError, TypeError):
+                raise CatalogueError(f"{source}: each design needs concrete, cement and ingredients") from None
+            yield _design(concrete, cement, mix, source)
+    else:
+        raise CatalogueError(f"{source}: unsupported JSON layout")
+
+
+def _design(concrete, cement, mix, source):
+    if not isinstance(concrete, str) or not isinstance(cement, str):
+        raise CatalogueError(f"{source}: concrete and cement names must be strings")
+    source = f"{source}: {concrete}/{cement}"
+    if not isinstance(mix, dict) or not all(isinstance(name, str) for name in mix):
+        raise CatalogueError(f"{source}: expected an object of ingredient amounts")
+    return concrete, cement, {name: _number(value, source) for name, value in mix.items()}
+
+
+def read_source(path):
+    """Yield designs from a CSV or JSON file, chosen by extension."""
+    if path.lower().endswith(".csv"):
+        return read_csv(path)
+    if path.lower().endswith(".json"):
+        return read_json(path)
+    raise CatalogueError(f"{path}: expected a .csv or .json file")
+
+
+def main(argv=None):
+    from beton.engine import builtin_table
+
+    parser = argparse.ArgumentParser(prog="python -m beton.catalogue", description="Mix catalogue tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build a catalogue from CSV/JSON files")
+    build.add_argument("output")
+    build.add_argument("inputs", nargs="*", help="CSV or JSON files (default: the built-in table)")
+    info = commands.add_parser("info", help="show catalogue statistics")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "build":
+            if args.inputs:
+                designs = (design for path in args.inputs for design in read_source(path))
+            else:
+                designs = iter_designs(builtin_table().as_dict())
+            write_catalogue(args.output, designs)
+        else:
+            with Catalogue(args.path) as catalogue:
+                print(f"{catalogue.n_designs} designs, {catalogue.n_classes} classes, "
+                      f"{catalogue.n_cements} cement types, {catalogue.n_ingredients} ingredients")
+    except (OSError, CatalogueError) as exc:
+        parser.exit(1, f"error: {exc}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""Command-line mix calculation for pour lists.
+
+Reads orders (concrete class, cement type, m³) as CSV or JSON lines from a
+file or stdin and writes one result per order as soon as it is computed, so
+memory use does not grow with the input. Kivy is never imported::
+
+    python -m beton orders.csv > results.csv
+    cat orders.jsonl | python -m beton --output-format jsonl
+
+CSV input has three columns ``concrete,cement,amount`` with an optional
+header row. JSON lines input has one ``{"concrete": ..., "cement": ...,
+"amount": ...}`` object per line. Amounts may use decimal commas,
+thousands separators, units and ranges (see :mod:`beton.quantity`). Orders
+that cannot be calculated are written with an ``error`` field and make the
+exit status 1; ``--strict`` stops at the first one instead. ``--workers N`` spreads the work over N
+processes (0 for one per CPU) while keeping the output in input order.
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+from itertools import chain, islice
+
+from beton import engine
+from beton.errors import MixError
+from beton.quantity import AmbiguousQuantity, QuantityError, parse_quantity
+
+CHUNK_SIZE = 1024  # orders calculated and written per output flush
+
+
+class OrderError(ValueError):
+    """Raised for an input row that is not a valid order."""
+
+
+def _detect_format(first_line):
+    return "jsonl" if first_line.lstrip().startswith("{") else "csv"
+
+
+def _is_header(row):
+    # Any digit makes it an order, so a bad amount is reported rather than skipped
+    return len(row) >= 3 and not any(char.isdigit() for char in row[2])
+
+
+def read_orders(stream, input_format=None):
+    """Yield ``(line, concrete, cement, amount, error)`` for each order in ``stream``.
+
+    ``amount`` is the raw text or JSON value; ``error`` is an
+    :class:`OrderError` for rows that could not be read, else ``None``.
+    """
+    # Look past leading blank lines to detect the format; they still count for line numbers
+    head = [stream.readline()]
+    while head[-1] and not head[-1].strip():
+        head.append(stream.readline())
+    if not head[-1]:
+        return
+    if input_format is None:
+        input_format = _detect_format(head[-1])
+    lines = chain(head, stream)
+
+    if input_format == "jsonl":
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                order = json.loads(line)
+                concrete, cement, amount = order["concrete"], order["cement"], order["amount"]
+            except (ValueError, KeyError, TypeError):
+                yield number, None, None, None, OrderError("expected a JSON object with concrete, cement and amount")
+                continue
+            if not isinstance(concrete, str) or not isinstance(cement, str):
+                yield number, None, None, None, OrderError("concrete and cement must be strings")
+                continue
+            yield number, concrete, cement, amount, None
+        return
+
+    reader = csv.reader(lines)
+    first_row = True
+    for row in reader:
+        if not row or not any(field.strip() for field in row):
+            continue
+        if first_row:
+            first_row = False
+            if _is_header(row):
+                continue
+        if len(row) != 3:
+            yield reader.line_num, None, None, None, OrderError("expected 3 columns: concrete, cement, amount")
+            continue
+        yield reader.line_num, row[0], row[1], row[2], None
+
+
+def parse_amount(value):
+    """Return the order volume in m³ as a float; see :func:`beton.quantity.parse_quantity`."""
+    try:
+        return parse_quantity(value)
+    except AmbiguousQuantity as exc:
+        raise OrderError(str(exc)) from None
+    except QuantityError:
+        raise OrderError(f"invalid amount {value!r}") from None
+
+
+def calculate_orders(orders, table=None):
+    """Yield ``(line, concrete, cement, amount, result, error)`` for each order.
+
+    ``result`` is a tuple of kg in ``table.ingredients`` order, or ``None``
+    when ``error`` holds the reason the order failed.
+    """
+    table = table or engine.get_table()
+    for line, concrete, cement, amount, error in orders:
+        result = None
+        if error is None:
+            try:
+                amount = parse_amount(amount)
+                result = tuple(table.scale(concrete.strip(), cement.strip(), amount).values())
+            except (MixError, OrderError) as exc:
+                error = exc
+        yield line, concrete, cement, amount, result, error
+
+
+class CSVResultWriter:
+    def __init__(self, stream, ingredients, header=True):
+        self._writer = csv.writer(stream, lineterminator="\n")
+        if header:
+            self._writer.writerow(["line", "concrete", "cement", "amount", *ingredients, "error"])
+        self._blank = [""] * len(ingredients)
+
+    def write(self, line, concrete, cement, amount, result, error):
+        amounts = [f"{q:.2f}" for q in result] if result is not None else self._blank
+        self._writer.writerow([line, concrete, cement, amount, *amounts, "" if error is None else str(error)])
+
+
+class JSONLResultWriter:
+    def __init__(self, stream, ingredients, header=True):
+        self._stream = stream
+        self._ingredients = ingredients
+
+    def write(self, line, concrete, cement, amount, result, error):
+        record = {"line": line, "concrete": concrete, "cement": cement, "amount": amount}
+        if error is None:
+            record["result"] = {name: round(q, 2) for name, q in zip(self._ingredients, result)}
+        else:
+            record["error"] = str(error)
+        self._stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+WRITERS = {"csv": CSVResultWriter, "jsonl": JSONLResultWriter}
+
+
+def _count(minimum):
+    """Return an argparse ``type`` accepting integers of at least ``minimum``."""
+    def parse(text):
+        try:
+            value = int(text)
+        except ValueError:
+            value = None
+        if value is None or value < minimum:
+            raise argparse.ArgumentTypeError(f"expected an integer of at least {minimum}, got {text!r}")
+        return value
+
+    return parse
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m beton", description="Calculate concrete mixes for a stream of orders."
+    )
+    parser.add_argument("input", nargs="?", default="-", help="CSV or JSON lines file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="default: detected from the first line")
+    parser.add_argument("--output-format", choices=sorted(WRITERS), default="csv")
+    parser.add_argument("--catalogue", help="mix catalogue to use instead of the built-in table")
+    parser.add_argument("--strict", action="store_true", help="stop at the first order that fails")
+    parser.add_argument("--workers", type=_count(0), default=1,
+                        help="worker processes; 0 for one per CPU (default: 1)")
+    parser.add_argument("--chunk-size", type=_count(1), default=20000,
+                        help="orders per chunk sent to a worker process")
+    return parser
+
+
+def _open(path, mode):
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    return open(path, mode, newline="" if "r" in mode else None, encoding="utf-8")
+
+
+def chunked(iterable, size):
+    """Yield lists of up to ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def process_chunk(chunk, table, output_format, strict=False):
+    """Calculate and format a chunk of orders.
+
+    Returns ``(text, error)``: the formatted rows and ``(line, message)`` of
+    the first failed order, or ``None``. With ``strict`` the text stops
+    before the first failed order.
+    """
+    buffer = io.StringIO()
+    writer = WRITERS[output_format](buffer, table.ingredients, header=False)
+    first_error = None
+    for item in calculate_orders(chunk, table):
+        error = item[-1]
+        if error is not None:
+            if first_error is None:
+                first_error = (item[0], str(error))
+            if strict:
+                break
+        writer.write(*item)
+    return buffer.getvalue(), first_error
+
+
+def run(args, outputs, ingredients):
+    """Write ``(text, error)`` chunk outputs to ``args.output``; return the exit status."""
+    output = _open(args.output, "w")
+    failed = False
+    try:
+        WRITERS[args.output_format](output, ingredients)
+        for text, error in outputs:
+            output.write(text)
+            output.flush()
+            if error is not None:
+                failed = True
+                if args.strict:
+                    print(f"error: line {error[0]}: {error[1]}", file=sys.stderr)
+                    return 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        if args.catalogue:
+            engine.load_catalogue(args.catalogue)
+        source = _open(args.input, "r")
+    except (OSError, ValueError) as exc:
+        parser.exit(2, f"error: {exc}\n")
+    table = engine.get_table()
+    orders = read_orders(source, args.input_format)
+    if args.workers == 1:
+        outputs = (
+            process_chunk(chunk, table, args.output_format, args.strict)
+            for chunk in chunked(orders, CHUNK_SIZE)
+        )
+    else:
+        from beton.parallel import process_chunks_parallel
+
+        outputs = process_chunks_parallel(
+            chunked(orders, args.chunk_size), args.output_format, args.strict,
+            workers=args.workers or None, catalogue_path=args.catalogue,
+        )
+    try:
+        return run(args, outputs, table.ingredients)
+    finally:
+        if source is not sys.stdin:
+            source.close()
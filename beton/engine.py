@@ -0,0 +1,227 @@
+"""Kivy-free concrete mix calculations.
+
+This module holds the mix table and the lookup-and-scale logic used by the
+GUI apps, so server tools can compute mixes without importing Kivy.
+"""
+
+import os
+
+from beton.cache import LRUCache
+from beton.errors import MixError, UnknownCementType, UnknownConcreteType
+from beton.table import MIX_KEY, MixTable
+
+# Path of a mix catalogue to load instead of the built-in table.
+CATALOGUE_ENV = "BETON_CATALOGUE"
+
+RESULT_CACHE_SIZE = 512
+
+_MIX_DATA = {
+    "C5": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 160, "Su": 200, "Kum": 900, "Çakıl": 1100},
+            "CEM 2": {"Çimento": 150, "Su": 195, "Kum": 920, "Çakıl": 1080},
+            "CEM 3": {"Çimento": 155, "Su": 198, "Kum": 910, "Çakıl": 1090},
+        }
+    },
+    "C10": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 200, "Su": 190, "Kum": 850, "Çakıl": 1150},
+            "CEM 2": {"Çimento": 190, "Su": 185, "Kum": 870, "Çakıl": 1130},
+            "CEM 3": {"Çimento": 195, "Su": 188, "Kum": 860, "Çakıl": 1140},
+        }
+    },
+    "C15": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 230, "Su": 180, "Kum": 820, "Çakıl": 1180},
+            "CEM 2": {"Çimento": 220, "Su": 175, "Kum": 840, "Çakıl": 1160},
+            "CEM 3": {"Çimento": 225, "Su": 178, "Kum": 830, "Çakıl": 1170},
+        }
+    },
+    "C20": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 300, "Su": 180, "Kum": 800, "Çakıl": 1200},
+            "CEM 2": {"Çimento": 280, "Su": 175, "Kum": 820, "Çakıl": 1180},
+            "CEM 3": {"Çimento": 290, "Su": 178, "Kum": 810, "Çakıl": 1190},
+        }
+    },
+    "C25": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 340, "Su": 175, "Kum": 780, "Çakıl": 1220},
+            "CEM 2": {"Çimento": 320, "Su": 170, "Kum": 800, "Çakıl": 1200},
+            "CEM 3": {"Çimento": 330, "Su": 173, "Kum": 790, "Çakıl": 1210},
+        }
+    },
+    "C30": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 380, "Su": 170, "Kum": 760, "Çakıl": 1240},
+            "CEM 2": {"Çimento": 360, "Su": 165, "Kum": 780, "Çakıl": 1220},
+            "CEM 3": {"Çimento": 370, "Su": 168, "Kum": 770, "Çakıl": 1230},
+        }
+    },
+    "C35": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 420, "Su": 165, "Kum": 740, "Çakıl": 1260},
+            "CEM 2": {"Çimento": 400, "Su": 160, "Kum": 760, "Çakıl": 1240},
+            "CEM 3": {"Çimento": 410, "Su": 163, "Kum": 750, "Çakıl": 1250},
+        }
+    },
+    "C40": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 450, "Su": 160, "Kum": 720, "Çakıl": 1280},
+            "CEM 2": {"Çimento": 430, "Su": 155, "Kum": 740, "Çakıl": 1260},
+            "CEM 3": {"Çimento": 440, "Su": 158, "Kum": 730, "Çakıl": 1270},
+        }
+    },
+    "C45": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 470, "Su": 155, "Kum": 710, "Çakıl": 1290},
+            "CEM 2": {"Çimento": 450, "Su": 150, "Kum": 730, "Çakıl": 1270},
+            "CEM 3": {"Çimento": 460, "Su": 153, "Kum": 720, "Çakıl": 1280},
+        }
+    },
+    "C50": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 490, "Su": 150, "Kum": 700, "Çakıl": 1300},
+            "CEM 2": {"Çimento": 470, "Su": 145, "Kum": 720, "Çakıl": 1280},
+            "CEM 3": {"Çimento": 480, "Su": 148, "Kum": 710, "Çakıl": 1290},
+        }
+    },
+    "C55": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 510, "Su": 145, "Kum": 690, "Çakıl": 1310},
+            "CEM 2": {"Çimento": 490, "Su": 140, "Kum": 710, "Çakıl": 1290},
+            "CEM 3": {"Çimento": 500, "Su": 143, "Kum": 700, "Çakıl": 1300},
+        }
+    },
+    "C60": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 530, "Su": 140, "Kum": 680, "Çakıl": 1320},
+            "CEM 2": {"Çimento": 510, "Su": 135, "Kum": 700, "Çakıl": 1300},
+            "CEM 3": {"Çimento": 520, "Su": 138, "Kum": 690, "Çakıl": 1310},
+        }
+    },
+    "C65": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 550, "Su": 135, "Kum": 670, "Çakıl": 1330},
+            "CEM 2": {"Çimento": 530, "Su": 130, "Kum": 690, "Çakıl": 1310},
+            "CEM 3": {"Çimento": 540, "Su": 133, "Kum": 680, "Çakıl": 1320},
+        }
+    },
+    "C70": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 570, "Su": 130, "Kum": 660, "Çakıl": 1340},
+            "CEM 2": {"Çimento": 550, "Su": 125, "Kum": 680, "Çakıl": 1320},
+            "CEM 3": {"Çimento": 560, "Su": 128, "Kum": 670, "Çakıl": 1330},
+        }
+    },
+    "C75": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 590, "Su": 125, "Kum": 650, "Çakıl": 1350},
+            "CEM 2": {"Çimento": 570, "Su": 120, "Kum": 670, "Çakıl": 1330},
+            "CEM 3": {"Çimento": 580, "Su": 123, "Kum": 660, "Çakıl": 1340},
+        }
+    },
+    "C80": {
+        "Karışım Oranları": {
+            "CEM 1": {"Çimento": 610, "Su": 120, "Kum": 640, "Çakıl": 1360},
+            "CEM 2": {"Çimento": 590, "Su": 115, "Kum": 660, "Çakıl": 1340},
+            "CEM 3": {"Çimento": 600, "Su": 118, "Kum": 650, "Çakıl": 1350},
+        }
+    }
+}
+
+
+_builtin_table = MixTable.from_dict(_MIX_DATA)
+del _MIX_DATA
+
+_table = None
+
+# Results of cached_mix(), keyed by normalize_query(); cleared by set_table().
+result_cache = LRUCache(RESULT_CACHE_SIZE)
+
+
+def __getattr__(name):
+    # ``beton_karisimlari`` is the string-keyed compatibility view of the
+    # active table; it is only materialised when someone asks for it.
+    if name == "beton_karisimlari":
+        view = globals()["beton_karisimlari"] = get_table().dense().as_dict()
+        return view
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def builtin_table():
+    """Return the :class:`MixTable` built from the mixes shipped with the app."""
+    return _builtin_table
+
+
+def get_table():
+    """Return the table used by the engine functions.
+
+    On first use this opens the catalogue named by ``$BETON_CATALOGUE`` if
+    set, otherwise the built-in table is used.
+    """
+    global _table
+    if _table is None:
+        path = os.environ.get(CATALOGUE_ENV)
+        _table = load_catalogue(path) if path else _builtin_table
+    return _table
+
+
+def set_table(table):
+    """Make ``table`` (a :class:`MixTable` or catalogue) the active table."""
+    global _table
+    _table = table
+    globals().pop("beton_karisimlari", None)
+    result_cache.clear()
+
+
+def load_catalogue(path):
+    """Open the catalogue at ``path`` and make it the active table."""
+    from beton.catalogue import Catalogue
+
+    catalogue = Catalogue(path)
+    set_table(catalogue)
+    return catalogue
+
+
+def concrete_types():
+    """Return the available concrete classes in table order."""
+    return list(get_table().concrete_types)
+
+
+def cement_types(concrete_type):
+    """Return the cement types available for a concrete class."""
+    return list(get_table().cements_for(concrete_type))
+
+
+def mix_ratios(concrete_type, cement_type):
+    """Return the per-m³ ingredient amounts (kg) for a concrete/cement pair."""
+    return get_table().scale(concrete_type, cement_type, 1)
+
+
+def calculate_mix(concrete_type, cement_type, amount):
+    """Scale the per-m³ mix by ``amount`` m³ and return kg per ingredient."""
+    return (_table or get_table()).scale(concrete_type, cement_type, amount)
+
+
+def normalize_query(concrete_type, cement_type, amount):
+    """Return the cache key for a query: stripped names and the amount as a float."""
+    return concrete_type.strip(), cement_type.strip(), float(amount)
+
+
+def cached_mix(concrete_type, cement_type, amount):
+    """Like :func:`calculate_mix`, but served from ``result_cache`` when possible.
+
+    The returned dict is shared with the cache and must not be modified.
+    A repeated query gets the same dict back, which lets
+    :class:`~beton.popups.PopupPool` skip refilling its labels.
+    """
+    key = normalize_query(concrete_type, cement_type, amount)
+    # Read before the table: a result computed from a table that set_table()
+    # replaced meanwhile (e.g. on a task worker) is returned but not cached.
+    generation = result_cache.generation
+    result = result_cache.get(key)
+    if result is None:
+        result = calculate_mix(*key)
+        result_cache.put(key, result, generation)
+    return result
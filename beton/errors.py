@@ -0,0 +1,18 @@
+"""Errors raised by the mix engine."""
+
+
+class MixError(LookupError):
+    """Raised when a concrete or cement type is not in the mix table."""
+
+
+class UnknownConcreteType(MixError):
+    def __init__(self, concrete_type):
+        super().__init__("Beton türü bulunamadı.")
+        self.concrete_type = concrete_type
+
+
+class UnknownCementType(MixError):
+    def __init__(self, concrete_type, cement_type):
+        super().__init__("Çimento türü bulunamadı.")
+        self.concrete_type = concrete_type
+        self.cement_type = cement_type
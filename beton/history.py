@@ -0,0 +1,269 @@
+"""Append-only record of every calculation, for invoicing.
+
+Entries go to a SQLite database in WAL mode. :meth:`HistoryStore.record`
+only puts the entry on a queue; a background thread writes queued entries in
+batches, one transaction each, so the UI thread never waits for the disk::
+
+    from beton.history import HistoryStore
+
+    history = HistoryStore("history.sqlite3")
+    history.record("C30", "CEM 1", 12.5, {"Çimento": 4750.0, ...})
+    history.query(start=datetime(2026, 5, 1), concrete_type="C30")
+    history.monthly_totals(2026)
+    history.close()
+
+A batch that cannot be written is retried a few times, then logged and
+dropped; the writer thread keeps running either way.
+
+Entries are indexed by time, class and cement type. Per-month totals are
+kept in a summary table updated in the same transaction as the entries, so
+they do not get slower as the history grows.
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 256  # entries per transaction at most
+FLUSH_INTERVAL = 0.5  # seconds a queued entry may wait for more to batch with
+WRITE_ATTEMPTS = 3  # tries per batch before its entries are dropped and logged
+RETRY_DELAY = 0.2  # seconds between tries
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    concrete_type TEXT NOT NULL,
+    cement_type TEXT NOT NULL,
+    amount REAL NOT NULL,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_timestamp ON entries (timestamp);
+CREATE INDEX IF NOT EXISTS entries_concrete ON entries (concrete_type, timestamp);
+CREATE INDEX IF NOT EXISTS entries_cement ON entries (cement_type, timestamp);
+CREATE TABLE IF NOT EXISTS monthly (
+    month TEXT NOT NULL,
+    concrete_type TEXT NOT NULL,
+    cement_type TEXT NOT NULL,
+    ingredient TEXT NOT NULL,
+    kg REAL NOT NULL,
+    PRIMARY KEY (month, concrete_type, cement_type, ingredient)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS monthly_volume (
+    month TEXT NOT NULL,
+    concrete_type TEXT NOT NULL,
+    cement_type TEXT NOT NULL,
+    calculations INTEGER NOT NULL,
+    volume REAL NOT NULL,
+    PRIMARY KEY (month, concrete_type, cement_type)
+) WITHOUT ROWID;
+"""
+
+_INSERT_ENTRY = (
+    "INSERT INTO entries (timestamp, concrete_type, cement_type, amount, result) VALUES (?, ?, ?, ?, ?)"
+)
+_ADD_MONTHLY = (
+    "INSERT INTO monthly VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (month, concrete_type, cement_type, ingredient) DO UPDATE SET kg = kg + excluded.kg"
+)
+_ADD_MONTHLY_VOLUME = (
+    "INSERT INTO monthly_volume VALUES (?, ?, ?, 1, ?) "
+    "ON CONFLICT (month, concrete_type, cement_type) DO UPDATE SET "
+    "calculations = calculations + 1, volume = volume + excluded.volume"
+)
+
+_CLOSE = object()
+
+
+class HistoryEntry:
+    """One recorded calculation; ``result`` maps ingredients to kg."""
+
+    __slots__ = ("id", "timestamp", "concrete_type", "cement_type", "amount", "result")
+
+    def __init__(self, id, timestamp, concrete_type, cement_type, amount, result):
+        self.id = id
+        self.timestamp = timestamp
+        self.concrete_type = concrete_type
+        self.cement_type = cement_type
+        self.amount = amount
+        self.result = result
+
+    @property
+    def time(self):
+        return datetime.fromtimestamp(self.timestamp)
+
+    def __repr__(self):
+        return (f"HistoryEntry({self.id}, {self.time:%Y-%m-%d %H:%M}, {self.concrete_type!r}, "
+                f"{self.cement_type!r}, {self.amount!r})")
+
+
+def _timestamp(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return value.timestamp()
+
+
+def _connect(path):
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class HistoryStore:
+    """Append-only calculation history backed by SQLite."""
+
+    def __init__(self, path, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        connection = _connect(path)
+        try:
+            connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+        self._reader = _connect(path)
+        self._read_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="beton-history", daemon=True)
+        self._writer.start()
+
+    def record(self, concrete_type, cement_type, amount, result, timestamp=None):
+        """Queue a calculation to be written; returns immediately."""
+        if timestamp is None:
+            timestamp = time.time()
+        self._queue.put((_timestamp(timestamp), concrete_type, cement_type, float(amount), dict(result)))
+
+    def _write_loop(self):
+        connection = _connect(self.path)
+        try:
+            while True:
+                item = self._queue.get()
+                batch = [item]
+                deadline = time.monotonic() + self.flush_interval
+                while item is not _CLOSE and len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    batch.append(item)
+                entries = [entry for entry in batch if entry is not _CLOSE]
+                try:
+                    if entries:
+                        self._write_batch(connection, entries)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if len(entries) != len(batch):
+                    return
+        finally:
+            connection.close()
+
+    def _write_batch(self, connection, entries):
+        # A failed transaction is rolled back, so the batch can be retried as is.
+        # The writer must outlive any error, or flush() and close() would hang.
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                self._write(connection, entries)
+                return
+            except Exception:
+                if attempt == WRITE_ATTEMPTS:
+                    logger.exception("Dropped %d history entries after %d failed writes",
+                                     len(entries), attempt)
+                    return
+                logger.warning("Writing %d history entries failed, retrying", len(entries), exc_info=True)
+                time.sleep(RETRY_DELAY)
+
+    def _write(self, connection, entries):
+        rows = []
+        monthly = []
+        volumes = []
+        for timestamp, concrete, cement, amount, result in entries:
+            month = datetime.fromtimestamp(timestamp).strftime("%Y-%m")
+            rows.append((timestamp, concrete, cement, amount, json.dumps(result, ensure_ascii=False)))
+            monthly.extend((month, concrete, cement, ingredient, kg) for ingredient, kg in result.items())
+            volumes.append((month, concrete, cement, amount))
+        with connection:
+            connection.executemany(_INSERT_ENTRY, rows)
+            connection.executemany(_ADD_MONTHLY, monthly)
+            connection.executemany(_ADD_MONTHLY_VOLUME, volumes)
+
+    def flush(self):
+        """Block until every queued entry has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Write what is queued and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_CLOSE)
+            self._writer.join()
+        self._reader.close()
+
+    def _read(self, sql, params):
+        with self._read_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _where(start, end, concrete_type, cement_type, time_column, start_value, end_value):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append(f"{time_column} >= ?")
+            params.append(start_value)
+        if end is not None:
+            clauses.append(f"{time_column} < ?")
+            params.append(end_value)
+        if concrete_type is not None:
+            clauses.append("concrete_type = ?")
+            params.append(concrete_type)
+        if cement_type is not None:
+            clauses.append("cement_type = ?")
+            params.append(cement_type)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, start=None, end=None, concrete_type=None, cement_type=None, limit=None):
+        """Return the :class:`HistoryEntry` list between ``start`` (inclusive) and ``end``, oldest first.
+
+        ``start`` and ``end`` are datetimes or Unix timestamps.
+        """
+        where, params = self._where(start, end, concrete_type, cement_type,
+                                    "timestamp", _timestamp(start), _timestamp(end))
+        sql = f"SELECT * FROM entries{where} ORDER BY timestamp, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return [
+            HistoryEntry(id, timestamp, concrete, cement, amount, json.loads(result))
+            for id, timestamp, concrete, cement, amount, result in self._read(sql, params)
+        ]
+
+    def count(self, start=None, end=None, concrete_type=None, cement_type=None):
+        where, params = self._where(start, end, concrete_type, cement_type,
+                                    "timestamp", _timestamp(start), _timestamp(end))
+        return self._read(f"SELECT COUNT(*) FROM entries{where}", params)[0][0]
+
+    def monthly_totals(self, year=None, concrete_type=None, cement_type=None):
+        """Return ``{"YYYY-MM": {"calculations", "volume", "kg": {ingredient: kg}}}``.
+
+        Totals are summed over the classes and cement types that match.
+        """
+        start = end = None
+        if year is not None:
+            start, end = f"{int(year):04d}-01", f"{int(year) + 1:04d}-01"
+        where, params = self._where(start, end, concrete_type, cement_type, "month", start, end)
+        totals = {}
+        for month, calculations, volume in self._read(
+            f"SELECT month, SUM(calculations), SUM(volume) FROM monthly_volume{where} "
+            "GROUP BY month ORDER BY month", params
+        ):
+            totals[month] = {"calculations": calculations, "volume": volume, "kg": {}}
+        for month, ingredient, kg in self._read(
+            f"SELECT month, ingredient, SUM(kg) FROM monthly{where} GROUP BY month, ingredient", params
+        ):
+            totals[month]["kg"][ingredient] = kg
+        return totals
@@ -0,0 +1,155 @@
+"""Opt-in timing and counting for the apps' hot paths.
+
+Set ``BETON_PROFILE=1`` (or ``true``/``yes``/``on``) to enable it, or set it
+to a file path to also choose where the apps append their periodic JSON
+snapshots; ``0``, ``false``, ``no``, ``off`` or an empty value leave it off.
+``BETON_PROFILE_OVERLAY=1`` also shows them on screen. When it is not
+set, :func:`timed` returns the decorated function unchanged and the apps
+skip every counting call, so disabled instrumentation costs nothing on the
+hot paths.
+
+Timings are kept in a rolling window per name and reported as percentiles::
+
+    from beton.instrumentation import metrics
+    metrics.snapshot()
+    # {"timings": {"calculate_mixture": {"count": 12, "p50_ms": 0.4, ...}},
+    #  "counters": {"calculations": 12, "widgets": 31}}
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+PROFILE_ENV = "BETON_PROFILE"
+OVERLAY_ENV = "BETON_PROFILE_OVERLAY"
+LOG_NAME = "beton_profile.log"
+PERCENTILES = (50, 90, 99)
+
+_ON = ("1", "true", "yes", "on")
+_OFF = ("", "0", "false", "no", "off")
+
+
+def parse_setting(value):
+    """Return ``(enabled, path)`` for a ``$BETON_PROFILE`` value.
+
+    On and off words (case-insensitive) give no path; any other value is
+    the log file path and enables profiling.
+    """
+    value = (value or "").strip()
+    if value.lower() in _OFF:
+        return False, None
+    if value.lower() in _ON:
+        return True, None
+    return True, value
+
+
+enabled = parse_setting(os.environ.get(PROFILE_ENV))[0]
+overlay_enabled = enabled and os.environ.get(OVERLAY_ENV, "").strip().lower() in _ON
+
+
+class Metrics:
+    """Rolling timing windows and counters, keyed by name."""
+
+    def __init__(self, window=500):
+        self.window = window
+        self.timings = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        samples = self.timings.get(name)
+        if samples is None:
+            with self._lock:
+                samples = self.timings.setdefault(name, deque(maxlen=self.window))
+        samples.append(seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def percentiles(self, name):
+        """Return ``{"count", "p50_ms", "p90_ms", "p99_ms", "max_ms"}`` for a timing."""
+        samples = sorted(self.timings.get(name, ()))
+        if not samples:
+            return {"count": 0}
+        summary = {"count": len(samples)}
+        for p in PERCENTILES:
+            index = min(len(samples) - 1, round(p / 100 * (len(samples) - 1)))
+            summary[f"p{p}_ms"] = round(samples[index] * 1000, 3)
+        summary["max_ms"] = round(samples[-1] * 1000, 3)
+        return summary
+
+    def snapshot(self):
+        return {
+            "time": time.time(),
+            "timings": {name: self.percentiles(name) for name in list(self.timings)},
+            "counters": dict(self.counters),
+        }
+
+    def write_log(self, path):
+        """Append the current snapshot to ``path`` as one JSON line."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.snapshot(), ensure_ascii=False) + "\n")
+
+    def reset(self):
+        with self._lock:
+            self.timings.clear()
+            self.counters.clear()
+
+
+metrics = Metrics()
+
+
+def timed(name):
+    """Decorator recording the duration of every call under ``name``.
+
+    Returns the function itself when instrumentation is disabled.
+    """
+    def decorate(function):
+        if not enabled:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                metrics.record(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorate
+
+
+def log_path(default_dir):
+    """Return the snapshot log file: ``$BETON_PROFILE`` if it is a path, else one in ``default_dir``.
+
+    ``default_dir`` may be a callable, so it is only evaluated when needed.
+    """
+    path = parse_setting(os.environ.get(PROFILE_ENV))[1]
+    if path is not None:
+        return path
+    if callable(default_dir):
+        default_dir = default_dir()
+    return os.path.join(default_dir, LOG_NAME)
+
+
+def count_widget_allocations():
+    """Count every Kivy widget created from now on under the ``widgets`` counter."""
+    from kivy.uix.widget import Widget
+
+    original_init = Widget.__init__
+    if getattr(original_init, "_counts_widgets", False):
+        return
+
+    @functools.wraps(original_init)
+    def counting_init(self, **kwargs):
+        metrics.count("widgets")
+        original_init(self, **kwargs)
+
+    counting_init._counts_widgets = True
+    Widget.__init__ = counting_init
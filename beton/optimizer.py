@@ -0,0 +1,182 @@
+"""Cheapest cement type per concrete class for given ingredient prices.
+
+:class:`CostModel` turns per-kg prices into a per-m³ cost for every
+class/cement combination once, so finding the cheapest mix is a lookup, and a
+whole list of pours is priced in one vectorized pass::
+
+    from beton.optimizer import CostModel
+
+    model = CostModel({"Çimento": 3.2, "Su": 0.01, "Kum": 0.35, "Çakıl": 0.4})
+    model.cheapest("C30")                      # Choice('C30', 'CEM 2', 1.0, 1914.65)
+    model.optimize_plan([("C30", 42.5), ("C20", 9)])
+    model.optimize_plan(pours, stock={"Çimento": 20000})
+
+With ``stock``, pours are taken in order and each gets the cheapest cement
+type whose ingredients still fit in what the earlier pours left; a pour that
+fits with no cement type raises :class:`InsufficientStock`. Ingredients left
+out of ``stock`` are not limited.
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+from beton.batch import numpy_views
+from beton.engine import get_table
+from beton.errors import UnknownConcreteType
+from beton.planner import check_volume
+from beton.table import ingredient_vector
+
+
+class InsufficientStock(ValueError):
+    """Raised when no cement type of a class fits in the remaining stock."""
+
+    def __init__(self, concrete_type, volume):
+        super().__init__(f"not enough stock for {volume:g} m³ of {concrete_type}")
+        self.concrete_type = concrete_type
+        self.volume = volume
+
+
+class Choice:
+    """The cement type picked for a volume of one class, and its cost."""
+
+    __slots__ = ("concrete_type", "cement_type", "volume", "cost")
+
+    def __init__(self, concrete_type, cement_type, volume, cost):
+        self.concrete_type = concrete_type
+        self.cement_type = cement_type
+        self.volume = volume
+        self.cost = cost
+
+    def __repr__(self):
+        return f"Choice({self.concrete_type!r}, {self.cement_type!r}, {self.volume!r}, {self.cost!r})"
+
+
+class CostModel:
+    """Per-m³ costs of every mix for one set of ingredient prices.
+
+    ``prices`` maps ingredient names to the price per kg; unpriced
+    ingredients cost nothing.
+    """
+
+    def __init__(self, prices, table=None):
+        self.table = table = (table or get_table()).dense()
+        self.prices = ingredient_vector(table, prices, "prices", missing=0.0)
+        n_classes, n_cements = len(table.concrete_types), len(table.cement_types)
+        if np is not None:
+            values, present = numpy_views(table)
+            costs = values @ np.asarray(self.prices)
+            costs[~present] = np.inf
+            best = costs.argmin(axis=1)
+            self.costs = costs
+            self.best_cement_ids = best
+            self.best_costs = costs[np.arange(n_classes), best]
+        else:
+            costs = []
+            for c in range(n_classes):
+                row = []
+                for m in range(n_cements):
+                    if table.present[c * n_cements + m]:
+                        start = table.offset(c, m)
+                        row.append(math.fsum(
+                            price * table.values[start + i] for i, price in enumerate(self.prices)
+                        ))
+                    else:
+                        row.append(math.inf)
+                costs.append(row)
+            self.costs = costs
+            self.best_cement_ids = [min(range(n_cements), key=row.__getitem__) for row in costs]
+            self.best_costs = [row[m] for row, m in zip(costs, self.best_cement_ids)]
+
+    def _stock_vector(self, stock):
+        # Unlike the solver's stock, an ingredient left out is not limited
+        return ingredient_vector(self.table, stock, "stock", missing=math.inf)
+
+    def _concrete_id(self, concrete_type):
+        c = self.table.concrete_ids.get(concrete_type)
+        if c is None:
+            raise UnknownConcreteType(concrete_type)
+        return c
+
+    def cost_per_m3(self, concrete_type, cement_type):
+        """Return the cost of one m³ of a mix."""
+        c, m = self.table.ids(concrete_type, cement_type)
+        return float(self.costs[c][m])
+
+    def cheapest(self, concrete_type, volume=1.0, stock=None):
+        """Return the cheapest :class:`Choice` for ``volume`` m³ of a class.
+
+        With ``stock`` (kg per ingredient), only cement types whose
+        ingredients fit are considered.
+        """
+        c = self._concrete_id(concrete_type)
+        volume = check_volume(volume)
+        if stock is None:
+            m = int(self.best_cement_ids[c])
+            return Choice(concrete_type, self.table.cement_types[m], volume, float(self.best_costs[c]) * volume)
+        m = self._cheapest_fitting(c, volume, self._stock_vector(stock))
+        if m is None:
+            raise InsufficientStock(concrete_type, volume)
+        return Choice(concrete_type, self.table.cement_types[m], volume, float(self.costs[c][m]) * volume)
+
+    def cheapest_by_class(self):
+        """Return ``{class: Choice}`` with the cheapest cement type for one m³ of each class."""
+        return {concrete: self.cheapest(concrete) for concrete in self.table.concrete_types}
+
+    def _cheapest_fitting(self, c, volume, stock):
+        """Return the id of the cheapest cement type for class ``c`` that fits in ``stock``."""
+        table = self.table
+        n_ingredients = len(table.ingredients)
+        best, best_cost = None, math.inf
+        for m in range(len(table.cement_types)):
+            cost = self.costs[c][m]
+            if cost >= best_cost:
+                continue
+            start = table.offset(c, m)
+            if all(volume * table.values[start + i] <= stock[i] * (1 + 1e-12) for i in range(n_ingredients)):
+                best, best_cost = m, cost
+        return best
+
+    def optimize_plan(self, pours, stock=None):
+        """Pick the cheapest cement type for each ``(concrete_type, volume)`` pour.
+
+        Returns ``(choices, total_cost)``. Without ``stock`` every pour gets
+        its class's cheapest cement type in one vectorized pass; with
+        ``stock`` the pours draw it down in order.
+        """
+        pours = [(concrete, check_volume(volume)) for concrete, volume in pours]
+        if stock is not None:
+            return self._optimize_with_stock(pours, self._stock_vector(stock))
+        c_ids = [self._concrete_id(concrete) for concrete, _ in pours]
+        cement_types = self.table.cement_types
+        if np is not None and pours:
+            c_ids = np.asarray(c_ids, dtype=np.intp)
+            volumes = np.fromiter((volume for _, volume in pours), dtype=np.float64, count=len(pours))
+            costs = (self.best_costs[c_ids] * volumes).tolist()
+            cements = self.best_cement_ids[c_ids].tolist()
+        else:
+            costs = [self.best_costs[c] * volume for c, (_, volume) in zip(c_ids, pours)]
+            cements = [self.best_cement_ids[c] for c in c_ids]
+        choices = [
+            Choice(concrete, cement_types[m], volume, cost)
+            for (concrete, volume), m, cost in zip(pours, cements, costs)
+        ]
+        return choices, math.fsum(costs)
+
+    def _optimize_with_stock(self, pours, stock):
+        table = self.table
+        n_ingredients = len(table.ingredients)
+        choices = []
+        for concrete, volume in pours:
+            c = self._concrete_id(concrete)
+            m = self._cheapest_fitting(c, volume, stock)
+            if m is None:
+                raise InsufficientStock(concrete, volume)
+            start = table.offset(c, m)
+            for i in range(n_ingredients):
+                stock[i] = max(0.0, stock[i] - volume * table.values[start + i])
+            choices.append(Choice(concrete, table.cement_types[m], volume, float(self.costs[c][m]) * volume))
+        return choices, math.fsum(choice.cost for choice in choices)
@@ -0,0 +1,43 @@
+"""On-screen debug overlay showing the instrumentation metrics.
+
+Imports Kivy; the apps add it only when ``BETON_PROFILE_OVERLAY=1``.
+"""
+
+from kivy.clock import Clock
+from kivy.uix.label import Label
+
+from beton.instrumentation import metrics
+
+REFRESH_INTERVAL = 1  # seconds
+
+
+class DebugOverlay(Label):
+    """A label listing p50/p90/p99 per timed call and the counters."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('size_hint', (1, None))
+        kwargs.setdefault('height', 160)
+        kwargs.setdefault('font_size', '12sp')
+        kwargs.setdefault('halign', 'left')
+        kwargs.setdefault('valign', 'top')
+        super().__init__(**kwargs)
+        self.bind(size=self._update_text_size)
+        self._event = Clock.schedule_interval(self.refresh, REFRESH_INTERVAL)
+
+    def _update_text_size(self, instance, size):
+        self.text_size = size
+
+    def refresh(self, *args):
+        snapshot = metrics.snapshot()
+        lines = []
+        for name, summary in sorted(snapshot['timings'].items()):
+            if summary['count']:
+                lines.append(
+                    f"{name}: p50 {summary['p50_ms']:.2f}  p90 {summary['p90_ms']:.2f}  "
+                    f"p99 {summary['p99_ms']:.2f} ms  (n={summary['count']})"
+                )
+        lines.append('  '.join(f"{name}={value}" for name, value in sorted(snapshot['counters'].items())))
+        self.text = '\n'.join(lines)
+
+    def stop(self):
+        self._event.cancel()
@@ -0,0 +1,71 @@
+"""Process-pool calculation for very large order streams.
+
+Orders are cut into chunks and spread over worker processes. Each worker
+builds its own dense copy of the mix table once, when it starts, and
+calculates and formats whole chunks so the parent only reads input and
+writes text. Results come back in input order, and only a bounded number of
+chunks is in flight at a time, so memory does not grow with the input.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from beton import engine
+from beton.cli import calculate_orders, chunked, process_chunk
+
+DEFAULT_CHUNK_SIZE = 20000
+CHUNKS_PER_WORKER = 2  # chunks queued per worker to keep workers busy
+
+_worker_table = None
+
+
+def _init_worker(catalogue_path):
+    global _worker_table
+    if catalogue_path:
+        engine.load_catalogue(catalogue_path)
+    _worker_table = engine.get_table().dense()
+
+
+def _process_chunk(chunk, output_format, strict):
+    return process_chunk(chunk, _worker_table, output_format, strict)
+
+
+def _calculate_chunk(chunk):
+    # Errors are sent back as their messages; the engine's exception types
+    # take constructor arguments that do not survive pickling.
+    return [
+        (line, concrete, cement, amount, result, None if error is None else str(error))
+        for line, concrete, cement, amount, result, error in calculate_orders(chunk, _worker_table)
+    ]
+
+
+def _ordered_map(function, chunks, extra_args, workers, catalogue_path):
+    """Yield ``function(chunk, *extra_args)`` for each chunk, in order, from a process pool."""
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(catalogue_path,)) as pool:
+        for chunk in chunks:
+            pending.append(pool.submit(function, chunk, *extra_args))
+            if len(pending) >= workers * CHUNKS_PER_WORKER:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def process_chunks_parallel(chunks, output_format, strict=False, workers=None, catalogue_path=None):
+    """Yield :func:`beton.cli.process_chunk` outputs for ``chunks``, computed by ``workers`` processes.
+
+    ``workers`` defaults to the number of CPUs. Workers open
+    ``catalogue_path`` if given, otherwise they use the built-in table.
+    """
+    return _ordered_map(_process_chunk, chunks, (output_format, strict), workers, catalogue_path)
+
+
+def calculate_orders_parallel(orders, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, catalogue_path=None):
+    """Like :func:`beton.cli.calculate_orders`, spread over ``workers`` processes.
+
+    Error fields in the results are strings.
+    """
+    for results in _ordered_map(_calculate_chunk, chunked(orders, chunk_size), (), workers, catalogue_path):
+        yield from results
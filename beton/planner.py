@@ -0,0 +1,179 @@
+"""Day plans: many pours, their ingredient totals and their truck loads.
+
+A :class:`PourPlan` keeps running totals, so adding, changing or removing a
+pour updates them in constant time instead of recalculating the whole plan::
+
+    from beton.planner import PourPlan
+
+    plan = PourPlan(truck_capacity=12)
+    foundation = plan.add("C30", "CEM 1", 42.5)
+    plan.add("C20", "CEM 2", 9)
+    plan.totals()           # {"Çimento": ..., "Su": ..., ...} for the whole day
+    plan.loads(foundation)  # four loads of 10.625 m³ with their kg per ingredient
+    plan.remove(foundation)
+
+Each pour is split into the fewest loads that fit in a truck, with the
+volume shared evenly between them. With ``min_load``, a pour smaller than
+that is batched as one load of ``min_load`` m³, the least the plant sends
+out; the plan's volume and totals count the batched volume::
+
+    plan = PourPlan(truck_capacity=12, min_load=3)
+    plan.add("C30", "CEM 1", 0.5)   # one load of 3 m³
+"""
+
+import math
+from array import array
+from itertools import count
+
+from beton.engine import get_table
+
+
+class Pour:
+    """One pour in a plan; ``offset`` points at its per-m³ row in the table.
+
+    ``batched`` is the volume sent out for it: ``volume`` raised to the
+    plan's minimum load.
+    """
+
+    __slots__ = ("pour_id", "concrete_type", "cement_type", "volume", "offset", "truck_loads", "batched")
+
+    def __init__(self, pour_id, concrete_type, cement_type, volume, offset, truck_loads, batched):
+        self.pour_id = pour_id
+        self.concrete_type = concrete_type
+        self.cement_type = cement_type
+        self.volume = volume
+        self.offset = offset
+        self.truck_loads = truck_loads
+        self.batched = batched
+
+    def __repr__(self):
+        return f"Pour({self.pour_id}, {self.concrete_type!r}, {self.cement_type!r}, {self.volume!r})"
+
+
+class Load:
+    """One truck load of a pour."""
+
+    __slots__ = ("pour_id", "number", "volume", "amounts")
+
+    def __init__(self, pour_id, number, volume, amounts):
+        self.pour_id = pour_id
+        self.number = number
+        self.volume = volume
+        self.amounts = amounts
+
+    def __repr__(self):
+        return f"Load({self.pour_id}, {self.number}, {self.volume!r}, {self.amounts!r})"
+
+
+def check_volume(volume):
+    """Return ``volume`` as a float, raising :class:`ValueError` unless it is finite and non-negative."""
+    volume = float(volume)
+    if not volume >= 0 or math.isinf(volume):
+        raise ValueError(f"invalid volume {volume!r}")
+    return volume
+
+
+class PourPlan:
+    """A set of pours with incrementally maintained totals.
+
+    The plan keeps the table it was created with, so a catalogue reload does
+    not change the quantities of pours already in it.
+
+    ``min_load`` may be at most half of ``truck_capacity``: an even split
+    into the fewest loads then never gives a load below it, so only pours
+    smaller than ``min_load`` need topping up.
+    """
+
+    def __init__(self, table=None, truck_capacity=12.0, min_load=0.0):
+        if not truck_capacity > 0:
+            raise ValueError("truck_capacity must be positive")
+        if not 0 <= min_load <= truck_capacity / 2:
+            raise ValueError("min_load must be between 0 and half the truck capacity")
+        self.table = (table or get_table()).dense()
+        self.truck_capacity = float(truck_capacity)
+        self.min_load = float(min_load)
+        self.pours = {}
+        self._ids = count(1)
+        self._totals = array("d", bytes(8 * len(self.table.ingredients)))
+        self._volume = 0.0
+        self._truck_loads = 0
+
+    def truck_loads_for(self, volume):
+        """Number of loads a pour of ``volume`` m³ is split into."""
+        return math.ceil(volume / self.truck_capacity - 1e-9) if volume > 0 else 0
+
+    def batched_volume(self, volume):
+        """Volume sent out for a pour of ``volume`` m³: at least ``min_load`` unless it is empty."""
+        return max(volume, self.min_load) if volume > 0 else 0.0
+
+    def _apply(self, pour, sign):
+        values = self.table.values
+        totals = self._totals
+        volume = sign * pour.batched
+        for i in range(len(totals)):
+            totals[i] += volume * values[pour.offset + i]
+        self._volume += volume
+        self._truck_loads += sign * pour.truck_loads
+        if not self.pours:
+            # Drop the rounding residue left by additions and removals.
+            self._totals = array("d", bytes(8 * len(totals)))
+            self._volume = 0.0
+
+    def add(self, concrete_type, cement_type, volume):
+        """Add a pour and return its id; raises the engine errors for unknown mixes."""
+        volume = check_volume(volume)
+        c, m = self.table.ids(concrete_type, cement_type)
+        pour_id = next(self._ids)
+        pour = Pour(pour_id, concrete_type, cement_type, volume,
+                    self.table.offset(c, m), self.truck_loads_for(volume), self.batched_volume(volume))
+        self.pours[pour_id] = pour
+        self._apply(pour, 1)
+        return pour_id
+
+    def remove(self, pour_id):
+        """Remove a pour; raises ``KeyError`` for an unknown id."""
+        pour = self.pours.pop(pour_id)
+        self._apply(pour, -1)
+        return pour
+
+    def set_volume(self, pour_id, volume):
+        """Change the volume of a pour."""
+        volume = check_volume(volume)
+        pour = self.pours[pour_id]
+        self._apply(pour, -1)
+        pour.volume = volume
+        pour.truck_loads = self.truck_loads_for(volume)
+        pour.batched = self.batched_volume(volume)
+        self._apply(pour, 1)
+
+    @property
+    def volume(self):
+        """Total m³ batched for the plan."""
+        return self._volume
+
+    @property
+    def truck_loads(self):
+        """Total number of truck loads in the plan."""
+        return self._truck_loads
+
+    def totals(self):
+        """Return the plan's kg per ingredient."""
+        return dict(zip(self.table.ingredients, self._totals))
+
+    def loads(self, pour_id):
+        """Return the :class:`Load` list for one pour."""
+        pour = self.pours[pour_id]
+        if not pour.truck_loads:
+            return []
+        volume = pour.batched / pour.truck_loads
+        per_m3 = self.table.values[pour.offset:pour.offset + len(self.table.ingredients)]
+        amounts = dict(zip(self.table.ingredients, [volume * q for q in per_m3]))
+        return [Load(pour_id, number, volume, dict(amounts)) for number in range(1, pour.truck_loads + 1)]
+
+    def schedule(self):
+        """Yield every load of every pour, in the order the pours were added."""
+        for pour_id in self.pours:
+            yield from self.loads(pour_id)
+
+    def __len__(self):
+        return len(self.pours)
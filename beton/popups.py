@@ -0,0 +1,89 @@
+"""Reusable result and error popups for the Kivy apps.
+
+Unlike the rest of the package this module imports Kivy, so only the apps
+import it.
+"""
+
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.label import Label
+from kivy.uix.popup import Popup
+from kivy.uix.scrollview import ScrollView
+
+
+class PopupPool:
+    """Build the result and error popups once and reuse them.
+
+    Each popup is created on first use; later calls only update the label
+    texts, adding a label when a result has more ingredients than any before.
+    ``widgets_created`` counts every widget the pool has allocated.
+    """
+
+    def __init__(self, text_color, scrollable=False, font_size='18sp',
+                 result_size_hint=(0.8, 0.8), error_size_hint=(0.8, 0.4)):
+        self.text_color = text_color
+        self.scrollable = scrollable
+        self.font_size = font_size
+        self.result_size_hint = result_size_hint
+        self.error_size_hint = error_size_hint
+        self.widgets_created = 0
+        self._result_popup = None
+        self._result_box = None
+        self._result_labels = []
+        self._shown_result = None
+        self._error_popup = None
+        self._error_label = None
+
+    def _new(self, widget_class, **kwargs):
+        self.widgets_created += 1
+        return widget_class(**kwargs)
+
+    def _new_label(self):
+        return self._new(Label, font_size=self.font_size, color=self.text_color)
+
+    def result_popup(self, result):
+        """Return the result popup with its labels filled in for ``result``."""
+        if self._result_popup is None:
+            if self.scrollable:
+                self._result_box = self._new(GridLayout, cols=1, padding=10, size_hint_y=None)
+                self._result_box.bind(minimum_height=self._result_box.setter('height'))
+                content = self._new(ScrollView, size_hint=(1, 1))
+                content.add_widget(self._result_box)
+            else:
+                content = self._result_box = self._new(BoxLayout, orientation='vertical', padding=10)
+            self._result_popup = self._new(
+                Popup, title='Karışım Sonuçları', content=content, size_hint=self.result_size_hint
+            )
+
+        # cached_mix() hands back the same dict for a repeated query, in
+        # which case the labels already show it.
+        if result is not self._shown_result:
+            labels = self._result_labels
+            while len(labels) < len(result):
+                labels.append(self._new_label())
+            if len(self._result_box.children) != len(result):
+                self._result_box.clear_widgets()
+                for label in labels[:len(result)]:
+                    self._result_box.add_widget(label)
+            for label, (ingredient, quantity) in zip(labels, result.items()):
+                label.text = f"{ingredient}: {quantity:.2f} kg"
+            self._shown_result = result
+        return self._result_popup
+
+    def error_popup(self, message):
+        """Return the error popup showing ``message``."""
+        if self._error_popup is None:
+            content = self._new(BoxLayout, orientation='vertical', padding=10)
+            self._error_label = self._new_label()
+            content.add_widget(self._error_label)
+            self._error_popup = self._new(
+                Popup, title='Hata', content=content, size_hint=self.error_size_hint
+            )
+        self._error_label.text = message
+        return self._error_popup
+
+    def show_result(self, result):
+        self.result_popup(result).open()
+
+    def show_error(self, message):
+        self.error_popup(message).open()
@@ -0,0 +1,179 @@
+"""Parse volumes typed by people: decimal commas, thousands separators, units and ranges.
+
+::
+
+    parse_quantity("12,5")          # 12.5
+    parse_quantity("1.250,75 m³")   # 1250.75
+    parse_quantity("1,250.75")      # 1250.75
+    parse_quantity("2500 L")        # 2.5
+    parse_quantity("10 yd³")        # 7.6455...
+    parse_range("8-12 m³")          # (8.0, 12.0)
+    parse_quantity("8-12 m³")       # 12.0, the upper end, so materials are never short
+
+Volumes are returned in m³. Digits are ASCII 0-9, with no exponents or
+underscores. A single ``,`` or ``.`` is the decimal
+separator. When both appear, the last one is. A separator repeated with
+groups of three digits, a space or an apostrophe separates thousands.
+Negative and NaN volumes, and volumes above :data:`MAX_VOLUME`, are rejected
+with :class:`QuantityError`; the cap keeps every scaled mix finite.
+
+A single separator followed by exactly three digits, as in ``"1.250"`` or
+``"1,250"``, means 1250 to some users and 1.25 to others, so it raises
+:class:`AmbiguousQuantity` instead of guessing. ``"1250"``, ``"1.250,0"``,
+``"1,25"`` and ``"0,250"`` are unambiguous.
+
+Plain numbers such as ``"12.5"`` and ``"12,5"`` skip the full parser; text
+with any other character goes through it.
+:func:`parse_quantities` applies that fast path to whole columns for bulk imports.
+"""
+
+import re
+
+MAX_VOLUME = 1e9  # m³; far beyond any real order
+
+# m³ per unit
+UNITS = {
+    "m³": 1.0, "m3": 1.0, "m^3": 1.0, "metreküp": 1.0, "metrekup": 1.0,
+    "l": 0.001, "lt": 0.001, "litre": 0.001, "liter": 0.001,
+    "yd³": 0.764554857984, "yd3": 0.764554857984, "yd^3": 0.764554857984,
+}
+
+_UNIT = re.compile(
+    r"\s*(" + "|".join(re.escape(unit) for unit in sorted(UNITS, key=len, reverse=True)) + r")\s*$"
+)
+_RANGE = re.compile(r"^(.+?)\s*(?:-|–|—|\.\.|ile)\s*(.+)$")
+_NUMBER_CHARS = re.compile(r"[0-9][0-9.,]*")
+_GROUPING = re.compile(r"[\s'’  ]")
+_THOUSANDS = re.compile(r"[0-9]{1,3}(?:[.,][0-9]{3})+")
+_AMBIGUOUS = re.compile(r"\s*[1-9][0-9]{0,2}[.,][0-9]{3}\s*")
+_SEPARATORS = (".", ",")
+# The only characters the fast paths hand to float(); text with anything else
+# that float() would take ("1_000", "1e3", non-ASCII digits) gets the full parser
+_PLAIN_CHARS = "0123456789., \t"
+
+# Characters the amount field accepts as they are typed
+INPUT_CHARS = frozenset("0123456789.,' -–" + "".join(UNITS).replace("^", "") + "MLYD")
+
+
+class QuantityError(ValueError):
+    """Raised for text that is not a valid volume."""
+
+    def __init__(self, text):
+        super().__init__(f"invalid quantity {text!r}")
+        self.text = text
+
+
+class AmbiguousQuantity(QuantityError):
+    """Raised for text like ``"1.250"`` that reads as thousands or as a decimal."""
+
+    def __init__(self, text):
+        ValueError.__init__(self, f"ambiguous quantity {text!r}: write 1250 or 1,25")
+        self.text = text
+
+
+def _check_unambiguous(text, original):
+    if _AMBIGUOUS.fullmatch(text):
+        raise AmbiguousQuantity(original)
+
+
+def _check(value, text):
+    if not 0 <= value <= MAX_VOLUME:
+        raise QuantityError(text)
+    return value
+
+
+def _number(text, original):
+    """Parse one number with optional decimal and thousands separators."""
+    text = _GROUPING.sub("", text)
+    if not _NUMBER_CHARS.fullmatch(text):
+        raise QuantityError(original)
+    commas, dots = text.count(","), text.count(".")
+    if commas and dots:
+        decimal = "," if text.rfind(",") > text.rfind(".") else "."
+        whole, _, fraction = text.rpartition(decimal)
+        if not _THOUSANDS.fullmatch(whole) and not whole.isdigit():
+            raise QuantityError(original)
+        text = whole.replace(",", "").replace(".", "") + "." + fraction
+    elif commas > 1 or dots > 1:
+        if not _THOUSANDS.fullmatch(text):
+            raise QuantityError(original)
+        text = text.replace(",", "").replace(".", "")
+    else:
+        _check_unambiguous(text, original)
+        text = text.replace(",", ".")
+    try:
+        return float(text)
+    except ValueError:
+        raise QuantityError(original) from None
+
+
+def _strip_unit(text):
+    match = _UNIT.search(text)
+    if match is None:
+        return text, None
+    return text[:match.start()], UNITS[match.group(1)]
+
+
+def parse_range(text):
+    """Return ``(low, high)`` in m³; a single volume gives ``(v, v)``."""
+    original = text
+    text = text.strip().lower()
+    text, unit = _strip_unit(text)
+    match = _RANGE.match(text)
+    if match is None:
+        value = _check(_number(text, original) * (unit or 1.0), original)
+        return value, value
+    low, low_unit = _strip_unit(match.group(1))
+    high = match.group(2)
+    low = _number(low, original) * (low_unit or unit or 1.0)
+    high = _number(high, original) * (unit or 1.0)
+    _check(low, original)
+    _check(high, original)
+    if low > high:
+        raise QuantityError(original)
+    return low, high
+
+
+def parse_quantity(value):
+    """Return the volume in m³ given by ``value``, text or a number.
+
+    For a range the upper end is returned.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return _check(float(value), value)
+    if not isinstance(value, str):
+        raise QuantityError(value)
+    # Fast path: plain numbers, with a decimal point or a single decimal comma
+    if value.strip(_PLAIN_CHARS):
+        return parse_range(value)[1]
+    try:
+        number = float(value.replace(",", ".") if value.count(",") == 1 and "." not in value else value)
+    except ValueError:
+        return parse_range(value)[1]
+    # Only text with a separator fourth from the end, or trailing space, can be ambiguous
+    if len(value) > 4 and (value[-4] in _SEPARATORS or value[-1] <= " "):
+        _check_unambiguous(value, value)
+    return _check(number, value)
+
+
+def parse_quantities(values):
+    """Parse a sequence of volumes at once, raising :class:`QuantityError` for the first bad one."""
+    results = []
+    append = results.append
+    for value in values:
+        try:
+            if value.strip(_PLAIN_CHARS):
+                raise ValueError
+            number = float(value.replace(",", ".", 1) if "," in value else value)
+        except (ValueError, TypeError, AttributeError):
+            append(parse_quantity(value))
+            continue
+        if len(value) > 4 and (value[-4] in _SEPARATORS or value[-1] <= " "):
+            _check_unambiguous(value, value)
+        append(number if 0 <= number <= MAX_VOLUME else _check(number, value))
+    return results
+
+
+def input_filter(substring, from_undo=False):
+    """``TextInput.input_filter`` keeping only characters a volume can contain."""
+    return "".join(char for char in substring if char in INPUT_CHARS)
@@ -0,0 +1,264 @@
+"""Local HTTP/JSON calculation service.
+
+A small asyncio server so several tablets can share one calculator::
+
+    python -m beton.server --host 0.0.0.0 --port 8080
+
+Endpoints (all responses are JSON):
+
+``GET /health``
+    ``{"status": "ok"}``
+``GET /types``
+    ``{"C5": ["CEM 1", ...], ...}`` — the available classes and cement types
+``POST /mix``
+    body ``{"concrete": "C30", "cement": "CEM 1", "amount": 12.5}``,
+    returns ``{"result": {"Çimento": ..., ...}}``
+``POST /batch``
+    body ``{"orders": [{"concrete": ..., "cement": ..., "amount": ...}, ...]}``,
+    returns ``{"results": [{"result": {...}} or {"error": "..."}, ...]}``
+
+Connections are kept alive (HTTP/1.1) until the client sends
+``Connection: close`` or stays idle for ``keep_alive_timeout`` seconds.
+Identical ``/mix`` queries that arrive while one is pending are answered
+from a single calculation.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from http import HTTPStatus
+
+from beton import engine
+from beton.cli import OrderError, parse_amount
+from beton.errors import MixError
+
+MAX_BODY = 1 << 20  # bytes
+MAX_HEADER_LINES = 100
+EXECUTOR_BATCH_SIZE = 1000  # batches at least this large are calculated off the event loop
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class QueryCoalescer:
+    """Calculate each distinct pending query once per event-loop iteration.
+
+    Queries submitted before the loop gets round to the scheduled flush
+    share one future; ``coalesced`` counts the queries that were answered
+    that way.
+    """
+
+    def __init__(self):
+        self.computed = 0
+        self.coalesced = 0
+        self._pending = {}
+
+    def submit(self, concrete_type, cement_type, amount):
+        key = engine.normalize_query(concrete_type, cement_type, amount)
+        future = self._pending.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return future
+        loop = asyncio.get_running_loop()
+        future = self._pending[key] = loop.create_future()
+        if len(self._pending) == 1:
+            loop.call_soon(self._flush)
+        return future
+
+    def _flush(self):
+        pending, self._pending = self._pending, {}
+        for key, future in pending.items():
+            self.computed += 1
+            try:
+                future.set_result(engine.cached_mix(*key))
+            except MixError as exc:
+                future.set_exception(exc)
+
+
+def _order_fields(order):
+    try:
+        concrete, cement, amount = order["concrete"], order["cement"], order["amount"]
+    except (KeyError, TypeError):
+        raise OrderError("expected concrete, cement and amount") from None
+    if not isinstance(concrete, str) or not isinstance(cement, str):
+        raise OrderError("concrete and cement must be strings")
+    return concrete, cement, parse_amount(amount)
+
+
+def _calculate_batch(orders):
+    table = engine.get_table()
+    results = []
+    for order in orders:
+        try:
+            concrete, cement, amount = _order_fields(order)
+            results.append({"result": table.scale(concrete.strip(), cement.strip(), amount)})
+        except (MixError, OrderError) as exc:
+            results.append({"error": str(exc)})
+    return results
+
+
+class MixServer:
+    def __init__(self, host="127.0.0.1", port=8080, keep_alive_timeout=15):
+        self.host = host
+        self.port = port
+        self.keep_alive_timeout = keep_alive_timeout
+        self.coalescer = QueryCoalescer()
+        self.requests = 0
+        self._server = None
+
+    async def start(self):
+        """Start listening; with ``port=0`` the chosen port is stored in ``self.port``."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.keep_alive_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except HTTPError as exc:
+                    await self._respond(writer, exc.status, {"error": str(exc)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, payload = await self._dispatch(method, path, body)
+                self.requests += 1
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _readline(reader, status, message):
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            # Longer than the stream limit (64 KiB)
+            raise HTTPError(status, message) from None
+
+    async def _read_request(self, reader):
+        request_line = await self._readline(reader, HTTPStatus.REQUEST_URI_TOO_LONG, "request line too long")
+        if not request_line:
+            return None
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "malformed request line") from None
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await self._readline(reader, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "header line too long")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "too many headers")
+        if version == "HTTP/1.0" and headers.get("connection", "").lower() != "keep-alive":
+            headers["connection"] = "close"
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "chunked request bodies are not supported")
+        length = headers.get("content-length", "0")
+        if not (length.isascii() and length.isdigit()):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+        length = int(length)
+        if length > MAX_BODY:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], headers, body
+
+    async def _dispatch(self, method, path, body):
+        routes = {
+            "/health": ("GET", self._health),
+            "/types": ("GET", self._types),
+            "/mix": ("POST", self._mix),
+            "/batch": ("POST", self._batch),
+        }
+        if path not in routes:
+            return HTTPStatus.NOT_FOUND, {"error": "not found"}
+        expected, handler = routes[path]
+        if method != expected:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"use {expected}"}
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"error": "invalid JSON"}
+        try:
+            return HTTPStatus.OK, await handler(data)
+        except OrderError as exc:
+            return HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+        except MixError as exc:
+            return HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(exc)}
+
+    async def _health(self, data):
+        return {"status": "ok"}
+
+    async def _types(self, data):
+        return {concrete: engine.cement_types(concrete) for concrete in engine.concrete_types()}
+
+    async def _mix(self, data):
+        return {"result": await self.coalescer.submit(*_order_fields(data))}
+
+    async def _batch(self, data):
+        orders = data.get("orders") if isinstance(data, dict) else None
+        if not isinstance(orders, list):
+            raise OrderError("expected {\"orders\": [...]}")
+        if len(orders) >= EXECUTOR_BATCH_SIZE:
+            results = await asyncio.get_running_loop().run_in_executor(None, _calculate_batch, orders)
+        else:
+            results = _calculate_batch(orders)
+        return {"results": results}
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m beton.server", description="Serve mix calculations over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--catalogue", help="mix catalogue to use instead of the built-in table")
+    parser.add_argument("--keep-alive-timeout", type=float, default=15)
+    args = parser.parse_args(argv)
+    if args.catalogue:
+        engine.load_catalogue(args.catalogue)
+    server = MixServer(args.host, args.port, args.keep_alive_timeout)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
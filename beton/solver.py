@@ -0,0 +1,124 @@
+"""Inverse calculation: how much concrete can be made from the stock on hand.
+
+Given the kg of each ingredient in the silos, the largest volume of a mix is
+the smallest ``stock / per-m³ amount`` over the ingredients it uses, and the
+ingredient reaching that minimum is the bottleneck. Every class/cement
+combination is evaluated in one pass over the dense table, with NumPy when
+it is installed::
+
+    from beton.solver import max_volumes
+
+    for capacity in max_volumes({"Çimento": 12000, "Su": 6000, "Kum": 40000, "Çakıl": 60000}):
+        print(capacity.concrete_type, capacity.cement_type, capacity.volume, capacity.bottleneck)
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+from beton.batch import numpy_views
+from beton.engine import get_table
+from beton.table import ingredient_vector
+
+
+class Capacity:
+    """The largest producible volume of one mix and the ingredient limiting it."""
+
+    __slots__ = ("concrete_type", "cement_type", "volume", "bottleneck")
+
+    def __init__(self, concrete_type, cement_type, volume, bottleneck):
+        self.concrete_type = concrete_type
+        self.cement_type = cement_type
+        self.volume = volume
+        self.bottleneck = bottleneck
+
+    def __repr__(self):
+        return (f"Capacity({self.concrete_type!r}, {self.cement_type!r}, "
+                f"{self.volume!r}, bottleneck={self.bottleneck!r})")
+
+
+def _stock_vector(table, stock):
+    # Unlike the optimizer's stock, an ingredient left out is not on hand
+    return ingredient_vector(table, stock, "stock quantities", missing=0.0)
+
+
+def _solve_numpy(table, stock):
+    values, present = numpy_views(table)
+    stock = np.asarray(stock, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Ingredients a mix does not use never limit it.
+        limits = np.where(values > 0, stock / values, np.inf)
+    bottlenecks = limits.argmin(axis=-1)
+    volumes = np.take_along_axis(limits, bottlenecks[..., None], axis=-1)[..., 0]
+    volumes[~present] = np.nan
+    return volumes, bottlenecks
+
+
+def _solve_python(table, stock):
+    n_cements = len(table.cement_types)
+    n_ingredients = len(table.ingredients)
+    values = table.values
+    volumes = []
+    bottlenecks = []
+    for pair, exists in enumerate(table.present):
+        if pair % n_cements == 0:
+            volumes.append([])
+            bottlenecks.append([])
+        volume, bottleneck = math.inf, 0
+        start = pair * n_ingredients
+        for i in range(n_ingredients):
+            per_m3 = values[start + i]
+            if per_m3 > 0 and stock[i] / per_m3 < volume:
+                volume, bottleneck = stock[i] / per_m3, i
+        volumes[-1].append(volume if exists else math.nan)
+        bottlenecks[-1].append(bottleneck)
+    return volumes, bottlenecks
+
+
+def capacity_matrix(stock, table=None):
+    """Return ``(volumes, bottlenecks)`` as classes × cement types matrices.
+
+    ``volumes`` holds the largest producible m³ per combination (NaN where
+    the table has no such mix, infinity for a mix that uses none of its
+    ingredients); ``bottlenecks`` holds the index into ``table.ingredients``
+    of the limiting ingredient. Both are NumPy arrays when NumPy is
+    installed, otherwise lists of row lists.
+    """
+    table = (table or get_table()).dense()
+    vector = _stock_vector(table, stock)
+    if np is None:
+        return _solve_python(table, vector)
+    return _solve_numpy(table, vector)
+
+
+def max_volumes(stock, table=None):
+    """Return a :class:`Capacity` for every class/cement combination, in table order.
+
+    ``stock`` maps ingredient names to kg on hand; ingredients left out
+    count as 0 kg.
+    """
+    table = (table or get_table()).dense()
+    volumes, bottlenecks = capacity_matrix(stock, table)
+    capacities = []
+    for c, concrete in enumerate(table.concrete_types):
+        for cement in table.cements_for(concrete):
+            m = table.cement_ids[cement]
+            volume = float(volumes[c][m])
+            bottleneck = table.ingredients[int(bottlenecks[c][m])] if volume != math.inf else None
+            capacities.append(Capacity(concrete, cement, volume, bottleneck))
+    return capacities
+
+
+def max_volume(concrete_type, cement_type, stock, table=None):
+    """Return the :class:`Capacity` of a single mix."""
+    table = (table or get_table()).dense()
+    vector = _stock_vector(table, stock)
+    amounts = table.row(concrete_type, cement_type).amounts
+    volume, bottleneck = math.inf, None
+    for ingredient, available, per_m3 in zip(table.ingredients, vector, amounts):
+        if per_m3 > 0 and available / per_m3 < volume:
+            volume, bottleneck = available / per_m3, ingredient
+    return Capacity(concrete_type, cement_type, volume, bottleneck)
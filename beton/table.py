@@ -0,0 +1,186 @@
+"""Integer-indexed mix table.
+
+Concrete classes, cement types and ingredients are interned once and given
+integer ids. Per-m³ amounts live in a single flat ``array('d')`` laid out as
+``[class][cement][ingredient]``, so a lookup is index arithmetic instead of
+walking three levels of string-keyed dicts.
+"""
+
+import sys
+from array import array
+
+from beton.errors import UnknownCementType, UnknownConcreteType
+
+MIX_KEY = "Karışım Oranları"
+ROW_CACHE_SIZE = 1024  # class/cement pairs whose (ingredient, kg) tuples scale() keeps
+
+
+class MixRow:
+    """One concrete/cement combination, referencing a slice of the table."""
+
+    __slots__ = ("table", "concrete_id", "cement_id", "offset", "_pairs")
+
+    def __init__(self, table, concrete_id, cement_id):
+        self.table = table
+        self.concrete_id = concrete_id
+        self.cement_id = cement_id
+        self.offset = table.offset(concrete_id, cement_id)
+        self._pairs = table._pairs(table.concrete_types[concrete_id], table.cement_types[cement_id])
+
+    @property
+    def concrete_type(self):
+        return self.table.concrete_types[self.concrete_id]
+
+    @property
+    def cement_type(self):
+        return self.table.cement_types[self.cement_id]
+
+    @property
+    def amounts(self):
+        """Per-m³ amounts in ``table.ingredients`` order."""
+        return tuple(quantity for _, quantity in self._pairs)
+
+    def scaled(self, amount):
+        """Return kg per ingredient for ``amount`` m³."""
+        return {ingredient: amount * quantity for ingredient, quantity in self._pairs}
+
+    def __repr__(self):
+        return f"MixRow({self.concrete_type!r}, {self.cement_type!r}, {self.amounts!r})"
+
+
+class MixTable:
+    """Dense per-m³ mix table keyed by integer class/cement/ingredient ids."""
+
+    def __init__(self, concrete_types, cement_types, ingredients, values, present):
+        self.concrete_types = tuple(sys.intern(name) for name in concrete_types)
+        self.cement_types = tuple(sys.intern(name) for name in cement_types)
+        self.ingredients = tuple(sys.intern(name) for name in ingredients)
+        self.concrete_ids = {name: i for i, name in enumerate(self.concrete_types)}
+        self.cement_ids = {name: i for i, name in enumerate(self.cement_types)}
+        self.ingredient_ids = {name: i for i, name in enumerate(self.ingredients)}
+        # values: len(classes) * len(cements) * len(ingredients) float64s
+        # present: one byte per class/cement pair, 1 when that mix exists
+        self.values = values
+        self.present = present
+        self._n_cements = len(self.cement_types)
+        self._n_ingredients = len(self.ingredients)
+        self._cements_by_class = tuple(
+            tuple(
+                self.cement_types[m]
+                for m in range(len(self.cement_types))
+                if present[c * len(self.cement_types) + m]
+            )
+            for c in range(len(self.concrete_types))
+        )
+        # (class, cement) -> ((ingredient, kg per m³), ...), filled on first
+        # lookup of a pair and emptied when full; the amounts stay in ``values``
+        self._rows = {}
+
+    @classmethod
+    def from_dict(cls, table):
+        """Build from the nested ``{class: {MIX_KEY: {cement: {ingredient: kg}}}}`` layout."""
+        concrete_types = list(table)
+        cement_types = []
+        ingredients = []
+        for concrete in table.values():
+            for cement, mix in concrete[MIX_KEY].items():
+                if cement not in cement_types:
+                    cement_types.append(cement)
+                for ingredient in mix:
+                    if ingredient not in ingredients:
+                        ingredients.append(ingredient)
+
+        cement_ids = {name: i for i, name in enumerate(cement_types)}
+        ingredient_ids = {name: i for i, name in enumerate(ingredients)}
+        n_cements, n_ingredients = len(cement_types), len(ingredients)
+        values = array("d", bytes(8 * len(concrete_types) * n_cements * n_ingredients))
+        present = bytearray(len(concrete_types) * n_cements)
+        for c, concrete in enumerate(table.values()):
+            for cement, mix in concrete[MIX_KEY].items():
+                pair = c * n_cements + cement_ids[cement]
+                present[pair] = 1
+                for ingredient, quantity in mix.items():
+                    values[pair * n_ingredients + ingredient_ids[ingredient]] = quantity
+        return cls(concrete_types, cement_types, ingredients, values, present)
+
+    def dense(self):
+        """Return the table itself; see :meth:`beton.catalogue.Catalogue.dense`."""
+        return self
+
+    def offset(self, concrete_id, cement_id):
+        """Index of the first ingredient of a class/cement pair in ``values``."""
+        return (concrete_id * self._n_cements + cement_id) * self._n_ingredients
+
+    def ids(self, concrete_type, cement_type):
+        """Resolve names to ``(concrete_id, cement_id)``, raising the engine errors."""
+        c = self.concrete_ids.get(concrete_type)
+        if c is None:
+            raise UnknownConcreteType(concrete_type)
+        m = self.cement_ids.get(cement_type)
+        if m is None or not self.present[c * self._n_cements + m]:
+            raise UnknownCementType(concrete_type, cement_type)
+        return c, m
+
+    def row(self, concrete_type, cement_type):
+        """Return the :class:`MixRow` for a concrete/cement pair."""
+        return MixRow(self, *self.ids(concrete_type, cement_type))
+
+    def cements_for(self, concrete_type):
+        """Return the cement types available for a class, in table order."""
+        c = self.concrete_ids.get(concrete_type)
+        if c is None:
+            raise UnknownConcreteType(concrete_type)
+        return self._cements_by_class[c]
+
+    def _pairs(self, concrete_type, cement_type):
+        """Return ``((ingredient, kg per m³), ...)`` for a pair, raising the engine errors."""
+        row = self._rows.get((concrete_type, cement_type))
+        if row is None:
+            start = self.offset(*self.ids(concrete_type, cement_type))
+            row = tuple(zip(self.ingredients, self.values[start:start + self._n_ingredients]))
+            if len(self._rows) >= ROW_CACHE_SIZE:
+                self._rows.clear()
+            self._rows[concrete_type, cement_type] = row
+        return row
+
+    def scale(self, concrete_type, cement_type, amount):
+        """Return kg per ingredient for ``amount`` m³ of the given mix."""
+        row = self._rows.get((concrete_type, cement_type))
+        if row is None:
+            row = self._pairs(concrete_type, cement_type)
+        return {ingredient: amount * quantity for ingredient, quantity in row}
+
+    def as_dict(self):
+        """Return the nested string-keyed view used by the original apps."""
+        view = {}
+        for c, concrete in enumerate(self.concrete_types):
+            mixes = {}
+            for cement in self._cements_by_class[c]:
+                start = self.offset(c, self.cement_ids[cement])
+                mixes[cement] = {
+                    ingredient: _as_number(self.values[start + i])
+                    for i, ingredient in enumerate(self.ingredients)
+                }
+            view[concrete] = {MIX_KEY: mixes}
+        return view
+
+
+def ingredient_vector(table, quantities, what, *, missing):
+    """Return ``quantities`` (per ingredient name) as a list in ``table.ingredients`` order.
+
+    Ingredients left out get ``missing``: 0 where they mean none on hand,
+    infinity where they mean unlimited. Unknown names and negative or NaN
+    values raise :class:`ValueError`; ``what`` names the values in the message.
+    """
+    unknown = set(quantities) - set(table.ingredient_ids)
+    if unknown:
+        raise ValueError(f"unknown ingredients: {', '.join(sorted(unknown))}")
+    vector = [float(quantities.get(ingredient, missing)) for ingredient in table.ingredients]
+    if any(not quantity >= 0 for quantity in vector):
+        raise ValueError(f"{what} must be non-negative")
+    return vector
+
+
+def _as_number(value):
+    """Show whole amounts as ints, as in the hand-written table."""
+    return int(value) if value.is_integer() else value
@@ -0,0 +1,112 @@
+"""Run slow work on worker threads and hand the results back to the UI thread.
+
+:class:`TaskScheduler` runs jobs on a small thread pool and calls their
+``on_done``/``on_error`` callbacks through ``post``, which defaults to Kivy's
+``Clock.schedule_once`` so callbacks run on the main thread and may touch
+widgets::
+
+    tasks = TaskScheduler()
+    tasks.submit(cached_mix, "C30", "CEM 1", 12.5, key="calculation",
+                 on_done=show_result, on_error=show_error)
+    tasks.cancel("calculation")  # e.g. the selection changed: drop the stale result
+
+Submitting a job with a ``key`` cancels the previous job with the same key.
+A cancelled job that already started still runs to the end, but its
+callbacks are never called.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+WORKERS = 2
+
+
+def _kivy_post(callback):
+    from kivy.clock import Clock
+
+    Clock.schedule_once(lambda dt: callback())
+
+
+class Task:
+    """A submitted job; ``cancel()`` discards its result."""
+
+    __slots__ = ("key", "future", "cancelled")
+
+    def __init__(self, key):
+        self.key = key
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+
+class TaskScheduler:
+    def __init__(self, workers=WORKERS, post=None):
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="beton-task")
+        self._post = post or _kivy_post
+        self._lock = threading.Lock()
+        self._by_key = {}
+
+    def submit(self, function, *args, key=None, on_done=None, on_error=None):
+        """Run ``function(*args)`` on a worker thread and return its :class:`Task`.
+
+        ``on_done(result)`` or ``on_error(exception)`` is then posted to the
+        main thread unless the task was cancelled first. Without
+        ``on_error``, exceptions are logged.
+        """
+        task = Task(key)
+        if key is not None:
+            with self._lock:
+                previous = self._by_key.get(key)
+                self._by_key[key] = task
+            if previous is not None:
+                previous.cancel()
+        task.future = self._executor.submit(function, *args)
+        task.future.add_done_callback(lambda future: self._finished(task, on_done, on_error))
+        return task
+
+    def _finished(self, task, on_done, on_error):
+        if task.cancelled or task.future.cancelled():
+            return
+        self._post(lambda: self._deliver(task, on_done, on_error))
+
+    def _deliver(self, task, on_done, on_error):
+        # Runs on the main thread; the task may have been cancelled since it finished.
+        if task.key is not None:
+            with self._lock:
+                if self._by_key.get(task.key) is task:
+                    del self._by_key[task.key]
+        if task.cancelled:
+            return
+        error = task.future.exception()
+        if error is None:
+            if on_done is not None:
+                on_done(task.future.result())
+        elif on_error is not None:
+            on_error(error)
+        else:
+            logger.error("Background task failed", exc_info=error)
+
+    def cancel(self, key):
+        """Cancel the pending task submitted with ``key``, if any."""
+        with self._lock:
+            task = self._by_key.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def shutdown(self, wait=True):
+        """Cancel queued tasks and stop the worker threads."""
+        with self._lock:
+            tasks, self._by_key = list(self._by_key.values()), {}
+        for task in tasks:
+            task.cancel()
+        self._executor.shutdown(wait=wait)
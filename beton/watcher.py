@@ -0,0 +1,129 @@
+"""Hot reloading of the active mix catalogue.
+
+:class:`CatalogueWatcher` polls a catalogue file and, when it has been
+replaced, opens the new version, works out which designs changed and makes
+it the engine's active table. Changed classes are found by comparing their
+raw record bytes, and decoded state for unchanged classes is carried over
+from the previous version, so a reload does not reparse the catalogue.
+Running apps call :meth:`CatalogueWatcher.poll` periodically on a worker
+thread (the Kivy apps submit it to their :class:`~beton.tasks.TaskScheduler`
+from ``Clock.schedule_interval``) and refresh only the spinner lists that the
+returned :class:`CatalogueChanges` touch.
+"""
+
+import os
+import struct
+
+from beton import engine
+from beton.catalogue import Catalogue, CatalogueError
+
+
+class CatalogueChanges:
+    """Designs that differ between two versions of a catalogue."""
+
+    __slots__ = ("added", "removed", "modified", "classes_changed", "rewritten")
+
+    def __init__(self, added, removed, modified, classes_changed, rewritten=False):
+        self.added = added
+        self.removed = removed
+        self.modified = modified
+        # True when the list of concrete classes itself changed
+        self.classes_changed = classes_changed
+        # True when the file was rewritten in place: the sets are empty and
+        # every class has to be treated as changed
+        self.rewritten = rewritten
+
+    @property
+    def affected_classes(self):
+        """Concrete classes with at least one added, removed or modified design."""
+        return {concrete for concrete, _ in self.added | self.removed | self.modified}
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.modified or self.classes_changed or self.rewritten)
+
+    def __repr__(self):
+        return (
+            f"CatalogueChanges(added={len(self.added)}, removed={len(self.removed)}, "
+            f"modified={len(self.modified)}, classes_changed={self.classes_changed}, "
+            f"rewritten={self.rewritten})"
+        )
+
+
+def _signature(stat):
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class CatalogueWatcher:
+    """Reload a catalogue file into the engine when it changes on disk.
+
+    ``on_change`` is called with a :class:`CatalogueChanges` after each
+    reload that changed at least one design. :meth:`poll` does file I/O and
+    may decode part of the catalogue, so apps run it on a worker thread.
+
+    Update the file by replacing it (write a temporary file, then rename it,
+    as ``python -m beton.catalogue build`` does). The open mapping keeps the
+    old version until the new one is loaded, and only the changed classes are
+    reread. A file rewritten in place (``scp``, ``adb push``) changes the
+    bytes under the open mapping, so lookups made during the copy may see
+    partial data. The watcher waits until the file is complete again and
+    reports it with ``rewritten`` set, since the old designs can no longer be
+    compared.
+    """
+
+    def __init__(self, path, on_change=None):
+        self.path = path
+        self.on_change = on_change
+        current = engine.get_table()
+        if isinstance(current, Catalogue) and os.path.abspath(current.path) == os.path.abspath(path):
+            self.catalogue = current
+        else:
+            self.catalogue = engine.load_catalogue(path)
+        self._loaded(self.catalogue)
+
+    def _loaded(self, catalogue):
+        self._signature = _signature(catalogue._stat)
+        self._rewritten = False
+        # Kept apart from the mapping, which an in-place rewrite overwrites
+        self._concrete_types = catalogue.concrete_types
+
+    def poll(self, *args):
+        """Check the file once; return the changes if it was reloaded, else ``None``.
+
+        Extra positional arguments are ignored so this can be passed straight
+        to ``Clock.schedule_interval``. A missing, half-written or damaged
+        file is skipped and retried on the next poll.
+        """
+        old = self.catalogue
+        try:
+            signature = _signature(os.stat(self.path))
+        except OSError:
+            return None
+        if signature == self._signature:
+            return None
+        if signature[2] == self._signature[2]:
+            # The loaded mapping has been written to, even if a replaced
+            # file comes next; it can no longer be compared against
+            self._rewritten = True
+        try:
+            new = Catalogue(self.path)
+        except (OSError, CatalogueError):
+            return None
+        try:
+            classes_changed = new.concrete_types != self._concrete_types
+            if self._rewritten:
+                changes = CatalogueChanges(set(), set(), set(), classes_changed, rewritten=True)
+            else:
+                changes = CatalogueChanges(*new.diff(old), classes_changed)
+                new.adopt(old, changes.affected_classes)
+        except (OSError, ValueError, struct.error):
+            # Damaged contents the size checks cannot see; the signature is
+            # left unchanged so the next poll tries again.
+            new.close()
+            return None
+        self._loaded(new)
+        self.catalogue = new
+        # Readers still holding ``old`` keep a valid mapping until it is collected.
+        engine.set_table(new)
+        if changes and self.on_change is not None:
+            self.on_change(changes)
+        return changes
@@ -0,0 +1,60 @@
+import pytest
+
+from beton import batch, engine
+from beton.batch import calculate_batch
+from beton.errors import UnknownCementType, UnknownConcreteType
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(batch, "np", None)
+    return request.param
+
+
+def orders():
+    table = engine.builtin_table()
+    return [
+        (concrete, cement, amount)
+        for concrete in table.concrete_types
+        for cement, amount in zip(table.cements_for(concrete), [0, 2.5, 12, 0.125])
+    ]
+
+
+def rows(result):
+    return [[float(kg) for kg in row] for row in result]
+
+
+def test_matches_single_calculations(backend):
+    table = engine.builtin_table()
+    concretes, cements, amounts = zip(*orders())
+    expected = [list(table.scale(*order).values()) for order in orders()]
+    assert rows(calculate_batch(concretes, cements, amounts, table)) == expected
+
+
+def test_backends_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    columns = list(zip(*orders()))
+    fast = rows(calculate_batch(*columns, engine.builtin_table()))
+    monkeypatch.setattr(batch, "np", None)
+    assert fast == rows(calculate_batch(*columns, engine.builtin_table()))
+
+
+def test_empty_batch(backend):
+    assert rows(calculate_batch([], [], [], engine.builtin_table())) == []
+
+
+@pytest.mark.parametrize("concrete, cement, error", [
+    ("C99", "CEM 1", UnknownConcreteType),
+    ("C30", "CEM 9", UnknownCementType),
+])
+def test_unknown_order_raises_engine_error(backend, concrete, cement, error):
+    with pytest.raises(error):
+        calculate_batch(["C30", concrete], ["CEM 1", cement], [1, 2], engine.builtin_table())
+
+
+def test_lengths_must_match(backend):
+    with pytest.raises(ValueError):
+        calculate_batch(["C30"], ["CEM 1"], [1, 2], engine.builtin_table())
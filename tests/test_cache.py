@@ -0,0 +1,53 @@
+import pytest
+
+from beton import engine
+from beton.cache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.info() == {"hits": 1, "misses": 1, "size": 2, "maxsize": 2}
+
+
+def test_maxsize_must_be_positive():
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+
+def test_cached_mix_shares_result_for_equal_queries():
+    engine.set_table(engine.builtin_table())
+    first = engine.cached_mix("C30", "CEM 1", 2)
+    assert engine.cached_mix(" C30 ", "CEM 1", 2.0) is first
+    assert first == engine.calculate_mix("C30", "CEM 1", 2.0)
+    engine.set_table(engine.builtin_table())
+    assert engine.cached_mix("C30", "CEM 1", 2.0) is not first
+
+
+def test_put_skips_values_from_before_clear():
+    cache = LRUCache()
+    generation = cache.generation
+    cache.clear()
+    cache.put("key", "stale", generation)
+    assert "key" not in cache
+    cache.put("key", "fresh", cache.generation)
+    assert cache.get("key") == "fresh"
+
+
+def test_cached_mix_does_not_cache_result_of_replaced_table(monkeypatch):
+    engine.set_table(engine.builtin_table())
+    calculate_mix = engine.calculate_mix
+
+    def table_replaced_meanwhile(*key):
+        result = calculate_mix(*key)
+        engine.set_table(engine.builtin_table())
+        return result
+
+    monkeypatch.setattr(engine, "calculate_mix", table_replaced_meanwhile)
+    assert engine.cached_mix("C30", "CEM 1", 2.0) == calculate_mix("C30", "CEM 1", 2.0)
+    assert len(engine.result_cache) == 0
@@ -0,0 +1,133 @@
+import json
+
+import pytest
+
+from beton import catalogue
+from beton.catalogue import Catalogue, CatalogueError, write_catalogue
+from beton.engine import builtin_table
+from beton.errors import UnknownCementType, UnknownConcreteType
+
+
+def builtin_designs():
+    table = builtin_table()
+    return [
+        (concrete, cement, dict(zip(table.ingredients, table.row(concrete, cement).amounts)))
+        for concrete in table.concrete_types
+        for cement in table.cements_for(concrete)
+    ]
+
+
+@pytest.fixture
+def catalogue_path(tmp_path):
+    path = tmp_path / "mixes.bin"
+    write_catalogue(str(path), builtin_designs())
+    return path
+
+
+def test_round_trip_matches_builtin_table(catalogue_path):
+    table = builtin_table()
+    with Catalogue(str(catalogue_path)) as catalogue:
+        assert catalogue.concrete_types == table.concrete_types
+        assert catalogue.ingredients == table.ingredients
+        assert [(c, m, dict(zip(catalogue.ingredients, a))) for c, m, a in catalogue.designs()] == builtin_designs()
+        assert catalogue.dense().as_dict() == table.as_dict()
+        assert catalogue.scale("C30", "CEM 1", 2.0) == table.scale("C30", "CEM 1", 2.0)
+        assert catalogue.cements_for("C30") == table.cements_for("C30")
+
+
+def test_lookup_errors(catalogue_path):
+    with Catalogue(str(catalogue_path)) as catalogue:
+        with pytest.raises(UnknownConcreteType):
+            catalogue.scale("C99", "CEM 1", 1)
+        with pytest.raises(UnknownCementType):
+            catalogue.scale("C30", "CEM 9", 1)
+
+
+def test_later_design_replaces_earlier(tmp_path):
+    path = str(tmp_path / "mixes.bin")
+    write_catalogue(path, [("C1", "A", {"x": 1}), ("C1", "A", {"x": 2})])
+    with Catalogue(path) as catalogue:
+        assert list(catalogue.designs()) == [("C1", "A", (2.0,))]
+
+
+def edited_designs():
+    designs = [design for design in builtin_designs() if design[:2] != ("C20", "CEM 3")]
+    for i, (concrete, cement, mix) in enumerate(designs):
+        if (concrete, cement) == ("C30", "CEM 1"):
+            designs[i] = (concrete, cement, dict(mix, Su=999.0))
+    return designs
+
+
+@pytest.mark.parametrize("extra, added", [
+    ([], set()),
+    # A new class changes the name tables, exercising the decoded comparison
+    ([("C99", "CEM 1", {"Çimento": 1, "Su": 1, "Kum": 1, "Çakıl": 1})], {("C99", "CEM 1")}),
+])
+def test_diff(tmp_path, catalogue_path, extra, added):
+    new_path = str(tmp_path / "new.bin")
+    write_catalogue(new_path, edited_designs() + extra)
+    with Catalogue(str(catalogue_path)) as old, Catalogue(new_path) as new:
+        assert new.diff(old) == (added, {("C20", "CEM 3")}, {("C30", "CEM 1")})
+        assert old.diff(old) == (set(), set(), set())
+
+
+def test_adopt_patches_decoded_table(tmp_path, catalogue_path):
+    new_path = str(tmp_path / "new.bin")
+    write_catalogue(new_path, edited_designs())
+    with Catalogue(str(catalogue_path)) as old, Catalogue(new_path) as new, Catalogue(new_path) as fresh:
+        old.dense()
+        old.cements_for("C40")
+        new.adopt(old, {"C20", "C30"})
+        assert new._table is not None
+        assert new.dense().as_dict() == fresh.dense().as_dict()
+        assert new.cements_for("C20") == fresh.cements_for("C20")
+        assert new.cements_for("C40") == fresh.cements_for("C40")
+
+
+@pytest.mark.parametrize("keep", [0, 10, 0.5, -1])
+def test_truncated_file_is_rejected(catalogue_path, keep):
+    data = catalogue_path.read_bytes()
+    size = int(len(data) * keep) if isinstance(keep, float) else keep % len(data)
+    catalogue_path.write_bytes(data[:size])
+    with pytest.raises(CatalogueError):
+        Catalogue(str(catalogue_path))
+
+
+def test_wrong_magic_is_rejected(catalogue_path):
+    data = bytearray(catalogue_path.read_bytes())
+    data[0:1] = b"X"
+    catalogue_path.write_bytes(bytes(data))
+    with pytest.raises(CatalogueError):
+        Catalogue(str(catalogue_path))
+
+
+@pytest.mark.parametrize("data", [
+    {"C30": {"CEM 1": {"Su": 150}}},
+    {"C30": [1, 2]},
+    {"C30": {"Karışım Oranları": {"CEM 1": {"Su": "abc"}}}},
+    {"C30": {"Karışım Oranları": {"CEM 1": {"Su": None}}}},
+    {"C30": {"Karışım Oranları": {"CEM 1": [150]}}},
+    [{"concrete": "C30", "cement": "CEM 1", "ingredients": {"Su": True}}],
+    [{"concrete": 30, "cement": "CEM 1", "ingredients": {"Su": 150}}],
+])
+def test_build_rejects_invalid_json(tmp_path, capsys, data):
+    source = tmp_path / "designs.json"
+    source.write_text(json.dumps(data), encoding="utf-8")
+    with pytest.raises(SystemExit) as exc:
+        catalogue.main(["build", str(tmp_path / "out.bin"), str(source)])
+    assert exc.value.code == 1
+    assert capsys.readouterr().err.startswith(f"error: {source}:")
+    assert not (tmp_path / "out.bin").exists()
+
+
+def test_build_accepts_numeric_strings(tmp_path):
+    source = tmp_path / "designs.json"
+    source.write_text(json.dumps({"C30": {"Karışım Oranları": {"CEM 1": {"Su": "150", "Kum": 700}}}}))
+    assert catalogue.main(["build", str(tmp_path / "out.bin"), str(source)]) == 0
+    with Catalogue(str(tmp_path / "out.bin")) as built:
+        assert built.dense().as_dict() == {"C30": {"Karışım Oranları": {"CEM 1": {"Su": 150.0, "Kum": 700.0}}}}
+
+
+def test_write_rejects_invalid_amounts(tmp_path):
+    with pytest.raises(CatalogueError, match="C30/CEM 1"):
+        write_catalogue(str(tmp_path / "out.bin"), [("C30", "CEM 1", {"Su": "abc"})])
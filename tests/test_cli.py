@@ -0,0 +1,104 @@
+import io
+import json
+
+import pytest
+
+from beton import cli, engine
+
+
+def orders(text, input_format=None):
+    return [
+        (line, concrete, cement, amount, error and str(error))
+        for line, concrete, cement, amount, error in cli.read_orders(io.StringIO(text), input_format)
+    ]
+
+
+@pytest.mark.parametrize("text", [
+    "concrete,cement,amount\nC30,CEM 1,2\n",
+    "\n\nconcrete,cement,amount\nC30,CEM 1,2\n",
+])
+def test_csv_header_is_skipped(text):
+    line = text.count("\n")
+    assert orders(text) == [(line, "C30", "CEM 1", "2", None)]
+
+
+def test_csv_first_row_with_a_bad_amount_is_an_order():
+    assert orders("C30,CEM 1,1e308\nC30,CEM 1,2\n") == [
+        (1, "C30", "CEM 1", "1e308", None),
+        (2, "C30", "CEM 1", "2", None),
+    ]
+
+
+def test_csv_bad_rows():
+    assert orders("C30,CEM 1,2\nC30,CEM 1\n") == [
+        (1, "C30", "CEM 1", "2", None),
+        (2, None, None, None, "expected 3 columns: concrete, cement, amount"),
+    ]
+
+
+def test_jsonl_after_blank_lines():
+    assert orders('\n{"concrete": "C30", "cement": "CEM 1", "amount": 2}\n') == [
+        (2, "C30", "CEM 1", 2, None),
+    ]
+
+
+@pytest.mark.parametrize("line, error", [
+    ('{"concrete": 30, "cement": "CEM 1", "amount": 2}', "concrete and cement must be strings"),
+    ('{"concrete": "C30", "cement": null, "amount": 2}', "concrete and cement must be strings"),
+    ('{"concrete": "C30", "amount": 2}', "expected a JSON object with concrete, cement and amount"),
+    ('[1, 2, 3]', "expected a JSON object with concrete, cement and amount"),
+    ('{"concrete": ', "expected a JSON object with concrete, cement and amount"),
+])
+def test_jsonl_bad_orders(line, error):
+    assert orders(line + "\n", "jsonl") == [(1, None, None, None, error)]
+
+
+def test_main_writes_errors_and_fails(tmp_path):
+    engine.set_table(engine.builtin_table())
+    source = tmp_path / "orders.jsonl"
+    source.write_text(
+        '{"concrete": "C30", "cement": "CEM 1", "amount": "2,5"}\n'
+        '{"concrete": 30, "cement": "CEM 1", "amount": 2}\n'
+        '{"concrete": "C30", "cement": "CEM 1", "amount": "x"}\n',
+        encoding="utf-8",
+    )
+    output = tmp_path / "results.jsonl"
+    assert cli.main([str(source), "-o", str(output), "--output-format", "jsonl"]) == 1
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert records[0]["result"] == {"Çimento": 950.0, "Su": 425.0, "Kum": 1900.0, "Çakıl": 3100.0}
+    assert records[1]["error"] == "concrete and cement must be strings"
+    assert records[2]["error"] == "invalid amount 'x'"
+
+
+@pytest.mark.parametrize("argv", [
+    ["--chunk-size", "0"],
+    ["--chunk-size", "-3"],
+    ["--workers", "-1"],
+    ["--workers", "two"],
+])
+def test_bad_counts_are_usage_errors(argv, capsys):
+    with pytest.raises(SystemExit) as exit:
+        cli.build_parser().parse_args(argv)
+    assert exit.value.code == 2
+    assert "expected an integer of at least" in capsys.readouterr().err
+
+
+def test_counts():
+    args = cli.build_parser().parse_args(["--workers", "0", "--chunk-size", "1"])
+    assert (args.workers, args.chunk_size) == (0, 1)
+
+
+def test_ambiguous_amount_in_first_row_is_an_order():
+    assert orders("C30,CEM 1,1.250\n") == [(1, "C30", "CEM 1", "1.250", None)]
+    with pytest.raises(cli.OrderError, match="ambiguous quantity '1.250'"):
+        cli.parse_amount("1.250")
+
+
+@pytest.mark.parametrize("output_format", ["csv", "jsonl"])
+def test_huge_amount_is_an_order_error(tmp_path, output_format):
+    source = tmp_path / "orders.csv"
+    source.write_text("C30,CEM 1,1e308\n", encoding="utf-8")
+    output = tmp_path / "results"
+    assert cli.main([str(source), "-o", str(output), "--output-format", output_format]) == 1
+    text = output.read_text(encoding="utf-8")
+    assert "inf" not in text.lower() and "invalid amount '1e308'" in text
@@ -0,0 +1,64 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from beton import history
+from beton.history import HistoryStore
+
+MIX = {"Çimento": 760.0, "Su": 340.0}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "RETRY_DELAY", 0)
+    store = HistoryStore(str(tmp_path / "history.sqlite3"), flush_interval=0.01)
+    yield store
+    store.close()
+
+
+def test_record_query_and_monthly_totals(store):
+    store.record("C30", "CEM 1", 2.0, MIX, timestamp=datetime(2026, 5, 3))
+    store.record("C25", "CEM 2", 1.0, MIX, timestamp=datetime(2026, 6, 1))
+    store.flush()
+    assert [(e.concrete_type, e.amount, e.result) for e in store.query()] == [
+        ("C30", 2.0, MIX), ("C25", 1.0, MIX)]
+    assert store.count(concrete_type="C25") == 1
+    assert store.monthly_totals(2026)["2026-05"] == {"calculations": 1, "volume": 2.0, "kg": MIX}
+
+
+def test_close_writes_queued_entries(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    store = HistoryStore(path, flush_interval=10)
+    store.record("C30", "CEM 1", 2.0, MIX)
+    store.close()
+    reopened = HistoryStore(path)
+    assert reopened.count() == 1
+    reopened.close()
+
+
+def test_failed_write_is_retried(store, monkeypatch):
+    write = store._write
+    failures = []
+
+    def fail_once(connection, entries):
+        if not failures:
+            failures.append(entries)
+            raise sqlite3.OperationalError("database is locked")
+        write(connection, entries)
+
+    monkeypatch.setattr(store, "_write", fail_once)
+    store.record("C30", "CEM 1", 2.0, MIX)
+    store.flush()
+    assert failures and store.count() == 1
+
+
+def test_writer_survives_a_batch_that_keeps_failing(store, monkeypatch, caplog):
+    monkeypatch.setattr(store, "_write", lambda connection, entries: 1 / 0)
+    store.record("C30", "CEM 1", 2.0, MIX)
+    store.flush()
+    assert "Dropped 1 history entries" in caplog.text
+    monkeypatch.undo()
+    store.record("C25", "CEM 2", 1.0, MIX)
+    store.flush()
+    assert [entry.concrete_type for entry in store.query()] == ["C25"]
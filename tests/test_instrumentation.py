@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from beton import instrumentation
+from beton.instrumentation import LOG_NAME, Metrics, log_path, parse_setting
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, (False, None)),
+    ("", (False, None)),
+    ("0", (False, None)),
+    ("false", (False, None)),
+    (" No ", (False, None)),
+    ("off", (False, None)),
+    ("1", (True, None)),
+    ("TRUE", (True, None)),
+    ("yes", (True, None)),
+    ("/tmp/profile.log", (True, "/tmp/profile.log")),
+    ("profile.jsonl", (True, "profile.jsonl")),
+])
+def test_parse_setting(value, expected):
+    assert parse_setting(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("0", os.path.join("data", LOG_NAME)),
+    ("true", os.path.join("data", LOG_NAME)),
+    ("/tmp/profile.log", "/tmp/profile.log"),
+])
+def test_log_path(monkeypatch, value, expected):
+    monkeypatch.setenv(instrumentation.PROFILE_ENV, value)
+    assert log_path(lambda: "data") == expected
+
+
+def test_timed(monkeypatch):
+    def square(x):
+        return x * x
+
+    monkeypatch.setattr(instrumentation, "enabled", False)
+    assert instrumentation.timed("square")(square) is square
+    monkeypatch.setattr(instrumentation, "enabled", True)
+    monkeypatch.setattr(instrumentation, "metrics", Metrics())
+    assert instrumentation.timed("square")(square)(3) == 9
+    assert instrumentation.metrics.percentiles("square")["count"] == 1
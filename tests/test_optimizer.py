@@ -0,0 +1,52 @@
+import math
+
+import pytest
+
+from beton import engine
+from beton.optimizer import CostModel, InsufficientStock
+
+PRICES = {"Çimento": 3.2, "Su": 0.01, "Kum": 0.35, "Çakıl": 0.4}
+
+
+@pytest.fixture
+def model():
+    return CostModel(PRICES, engine.builtin_table())
+
+
+def test_cheapest_matches_brute_force(model):
+    table = engine.builtin_table()
+    for concrete in table.concrete_types:
+        costs = {
+            cement: math.fsum(PRICES[name] * kg for name, kg in table.scale(concrete, cement, 1).items())
+            for cement in table.cements_for(concrete)
+        }
+        choice = model.cheapest(concrete, 2)
+        assert choice.cement_type == min(costs, key=costs.get)
+        assert choice.cost == pytest.approx(2 * costs[choice.cement_type])
+
+
+def test_stock_leaves_unlisted_ingredients_unlimited(model):
+    pours = [("C30", 42.5), ("C20", 9)]
+    choices, total = model.optimize_plan(pours, stock={"Çimento": 20000})
+    unlimited, unlimited_total = model.optimize_plan(pours)
+    assert [c.cement_type for c in choices] == [c.cement_type for c in unlimited]
+    assert total == pytest.approx(unlimited_total)
+    assert model.cheapest("C30", 10, stock={"Çimento": 4000}).cement_type == "CEM 2"
+
+
+def test_stock_is_drawn_down_in_order(model):
+    # 10 m³ of C30 with CEM 2 uses 3600 kg; only CEM 2 (360 kg/m³) fits the second pour too
+    choices, _ = model.optimize_plan([("C30", 10), ("C30", 10)], stock={"Çimento": 7300})
+    assert [choice.cement_type for choice in choices] == ["CEM 2", "CEM 2"]
+    with pytest.raises(InsufficientStock):
+        model.optimize_plan([("C30", 10), ("C30", 10)], stock={"Çimento": 7100})
+
+
+@pytest.mark.parametrize("volume", [-1, math.inf, math.nan])
+def test_invalid_volumes_are_rejected(model, volume):
+    with pytest.raises(ValueError):
+        model.cheapest("C30", volume)
+    with pytest.raises(ValueError):
+        model.optimize_plan([("C30", 1), ("C20", volume)])
+    with pytest.raises(ValueError):
+        model.optimize_plan([("C30", volume)], stock={"Çimento": 1000})
@@ -0,0 +1,64 @@
+import io
+
+import pytest
+
+from beton import cli, engine
+from beton.catalogue import write_catalogue
+from beton.parallel import calculate_orders_parallel, process_chunks_parallel
+
+ROWS = ["C30,CEM 1,2", "C20,CEM 2,12,5", "C99,CEM 1,1", "C30,CEM 1,abc", "C40,CEM 1,0,25", "C30,CEM 9,3"] * 4
+
+
+@pytest.fixture(autouse=True)
+def builtin_table():
+    engine.set_table(engine.builtin_table())
+    yield
+    engine.set_table(engine.builtin_table())
+
+
+def orders():
+    return list(cli.read_orders(io.StringIO("\n".join(ROWS) + "\n"), "csv"))
+
+
+def run_cli(tmp_path, *args):
+    source = tmp_path / "orders.csv"
+    source.write_text("\n".join(ROWS) + "\n", encoding="utf-8")
+    output = tmp_path / "results"
+    status = cli.main([str(source), "-o", str(output), *args])
+    return status, output.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("output_format", ["csv", "jsonl"])
+@pytest.mark.parametrize("strict", [False, True])
+def test_cli_workers_match_serial(tmp_path, output_format, strict):
+    args = ["--output-format", output_format] + ["--strict"] * strict
+    assert run_cli(tmp_path, *args, "--workers", "2", "--chunk-size", "5") == run_cli(tmp_path, *args)
+
+
+def test_process_chunks_parallel_keeps_order():
+    table = engine.get_table()
+    chunks = list(cli.chunked(orders(), 5))
+    serial = [cli.process_chunk(chunk, table, "csv") for chunk in chunks]
+    assert list(process_chunks_parallel(iter(chunks), "csv", workers=2)) == serial
+
+
+def test_calculate_orders_parallel_matches_serial():
+    serial = [
+        (line, concrete, cement, amount, result, None if error is None else str(error))
+        for line, concrete, cement, amount, result, error in cli.calculate_orders(orders())
+    ]
+    assert list(calculate_orders_parallel(orders(), workers=2, chunk_size=5)) == serial
+
+
+def test_workers_open_the_catalogue(tmp_path):
+    table = engine.builtin_table()
+    designs = [("C30", "CEM 1", {"Çimento": 1, "Su": 2})] + [
+        (concrete, cement, dict(table.scale(concrete, cement, 1)))
+        for concrete in table.concrete_types
+        for cement in table.cements_for(concrete)
+        if concrete != "C30"
+    ]
+    path = tmp_path / "mixes.bin"
+    write_catalogue(str(path), designs)
+    results = list(calculate_orders_parallel(orders()[:1], workers=2, catalogue_path=str(path)))
+    assert results[0][4] == (2.0, 4.0, 0.0, 0.0)
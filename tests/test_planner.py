@@ -0,0 +1,62 @@
+import math
+
+import pytest
+
+from beton import engine
+from beton.planner import PourPlan
+
+
+@pytest.fixture
+def table():
+    return engine.builtin_table()
+
+
+def test_totals_follow_changes(table):
+    plan = PourPlan(table, truck_capacity=12)
+    slab = plan.add("C30", "CEM 1", 42.5)
+    plan.add("C20", "CEM 2", 9)
+    c30, c20 = table.scale("C30", "CEM 1", 42.5), table.scale("C20", "CEM 2", 9)
+    expected = {name: c30[name] + c20[name] for name in table.ingredients}
+    assert plan.totals() == pytest.approx(expected)
+    assert (plan.volume, plan.truck_loads) == (51.5, 5)
+    plan.set_volume(slab, 24)
+    assert (plan.volume, plan.truck_loads) == (33.0, 3)
+    plan.remove(slab)
+    assert plan.totals() == pytest.approx(table.scale("C20", "CEM 2", 9))
+
+
+@pytest.mark.parametrize("volume, loads", [
+    (0, []), (0.5, [0.5]), (12, [12.0]), (13, [6.5, 6.5]), (42.5, [10.625] * 4),
+])
+def test_loads_are_even_and_fit_a_truck(table, volume, loads):
+    plan = PourPlan(table, truck_capacity=12)
+    pour = plan.add("C30", "CEM 1", volume)
+    assert [load.volume for load in plan.loads(pour)] == loads
+    assert plan.truck_loads == len(loads)
+
+
+def test_small_pours_are_topped_up_to_min_load(table):
+    plan = PourPlan(table, truck_capacity=12, min_load=3)
+    small = plan.add("C30", "CEM 1", 0.5)
+    [load] = plan.loads(small)
+    assert load.volume == 3
+    assert load.amounts == table.scale("C30", "CEM 1", 3)
+    assert plan.volume == 3
+    assert plan.totals() == pytest.approx(load.amounts)
+    plan.set_volume(small, 13)
+    assert [load.volume for load in plan.loads(small)] == [6.5, 6.5]
+    assert plan.volume == 13
+    plan.set_volume(small, 0)
+    assert (plan.volume, plan.truck_loads, plan.loads(small)) == (0, 0, [])
+
+
+@pytest.mark.parametrize("min_load", [-1, 6.5, math.nan])
+def test_invalid_min_load(table, min_load):
+    with pytest.raises(ValueError):
+        PourPlan(table, truck_capacity=12, min_load=min_load)
+
+
+@pytest.mark.parametrize("volume", [-1, math.inf, math.nan])
+def test_invalid_volume(table, volume):
+    with pytest.raises(ValueError):
+        PourPlan(table).add("C30", "CEM 1", volume)
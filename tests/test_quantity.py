@@ -0,0 +1,76 @@
+import math
+
+import pytest
+
+from beton.quantity import AmbiguousQuantity, QuantityError, parse_quantities, parse_quantity, parse_range
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("12", 12.0),
+    ("12,5", 12.5),
+    ("12.5", 12.5),
+    (" 12,5 ", 12.5),
+    ("1,25", 1.25),
+    ("0,250", 0.25),
+    ("0.250", 0.25),
+    (",250", 0.25),
+    ("1250.500", 1250.5),
+    ("1250,500", 1250.5),
+    ("1.250,75", 1250.75),
+    ("1,250.75", 1250.75),
+    ("1.250,0", 1250.0),
+    ("1.250.000", 1250000.0),
+    ("1,250,000", 1250000.0),
+    ("1 250", 1250.0),
+    ("1'250,5", 1250.5),
+    ("12,5 m³", 12.5),
+    ("12.5m3", 12.5),
+    ("2500 L", 2.5),
+    ("10 yd³", 7.64554857984),
+    ("8-12 m³", 12.0),
+    ("8,5 ile 12,5", 12.5),
+    (12, 12.0),
+    (12.5, 12.5),
+])
+def test_parse_quantity(text, expected):
+    assert parse_quantity(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", [
+    "1.250", "1,250", "12.500", "125,000", " 1.250 ", "1.250 m³", "1,250 L", "1-1.250",
+])
+def test_single_separator_before_three_digits_is_ambiguous(text):
+    with pytest.raises(AmbiguousQuantity):
+        parse_quantity(text)
+
+
+@pytest.mark.parametrize("text", [
+    "", "abc", "-1", "1,2,3", "1.25.0", "inf", "nan", "12 kg", "12-8", True, None, math.inf, -0.5,
+    1e308, "2000000000", "2.000.000.000 m³", "1-1e308",
+])
+def test_invalid(text):
+    with pytest.raises(QuantityError):
+        parse_quantity(text)
+
+
+@pytest.mark.parametrize("text", ["1_000", "1e3", "1E3", "1,5e3", "+5", "-0", "١٢", "１２", "1_000 m3", "1e3 m3"])
+def test_only_plain_numbers_take_the_float_fast_path(text):
+    with pytest.raises(QuantityError):
+        parse_quantity(text)
+    with pytest.raises(QuantityError):
+        parse_quantities(["12,5", text])
+
+
+def test_parse_range():
+    assert parse_range("8-12 m³") == (8.0, 12.0)
+    assert parse_range("500 L - 2 m³") == (0.5, 2.0)
+    assert parse_range("7") == (7.0, 7.0)
+
+
+def test_parse_quantities_matches_parse_quantity():
+    values = ["12", "12,5", "1.250,75", "8-12 m³", 3]
+    assert parse_quantities(values) == [parse_quantity(value) for value in values]
+    with pytest.raises(AmbiguousQuantity):
+        parse_quantities(["12,5", "1,250"])
+    with pytest.raises(QuantityError):
+        parse_quantities(["12,5", "-3"])
@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+import pytest
+
+from beton import engine
+from beton.server import MixServer
+
+
+async def _exchange(request):
+    server = await MixServer(port=0).start()
+    try:
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(request)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    finally:
+        await server.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def request(method, path, body=b"", headers=()):
+    lines = [f"{method} {path} HTTP/1.1", "Connection: close", *headers]
+    if body and not headers:
+        lines.append(f"Content-Length: {len(body)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+def exchange(data):
+    engine.set_table(engine.builtin_table())
+    return asyncio.run(_exchange(data))
+
+
+def test_mix():
+    body = json.dumps({"concrete": "C30", "cement": "CEM 1", "amount": "2,5"}).encode()
+    assert exchange(request("POST", "/mix", body)) == (
+        200, {"result": {"Çimento": 950.0, "Su": 425.0, "Kum": 1900.0, "Çakıl": 3100.0}}
+    )
+
+
+@pytest.mark.parametrize("length", ["-5", "+5", "1_0", "five"])
+def test_invalid_content_length(length):
+    assert exchange(request("POST", "/mix", b"{}", [f"Content-Length: {length}"])) == (
+        400, {"error": "invalid Content-Length"}
+    )
+
+
+def test_header_line_too_long():
+    assert exchange(request("GET", "/health", headers=["X-Padding: " + "a" * 70000])) == (
+        431, {"error": "header line too long"}
+    )
+
+
+def test_request_line_too_long():
+    assert exchange(request("GET", "/health?" + "a" * 70000)) == (414, {"error": "request line too long"})
+
+
+@pytest.mark.parametrize("order, status, error", [
+    ({"concrete": "C30", "cement": "CEM 1", "amount": 1e308}, 400, "invalid amount 1e+308"),
+    ({"concrete": "C30", "cement": "CEM 1", "amount": -1}, 400, "invalid amount -1"),
+    ({"concrete": 30, "cement": "CEM 1", "amount": 1}, 400, "concrete and cement must be strings"),
+    ({"concrete": "C99", "cement": "CEM 1", "amount": 1}, 422, None),
+])
+def test_mix_errors(order, status, error):
+    code, payload = exchange(request("POST", "/mix", json.dumps(order).encode()))
+    assert code == status
+    assert error is None or payload == {"error": error}
+
+
+def test_batch_reports_errors_per_order():
+    orders = [{"concrete": "C30", "cement": "CEM 1", "amount": amount} for amount in (1, 1e308)]
+    code, payload = exchange(request("POST", "/batch", json.dumps({"orders": orders}).encode()))
+    assert code == 200
+    assert payload["results"][1] == {"error": "invalid amount 1e+308"}
+    assert payload["results"][0]["result"]["Çimento"] == 380.0
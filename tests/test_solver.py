@@ -0,0 +1,105 @@
+import math
+
+import pytest
+
+from beton import MIX_KEY, engine, solver
+from beton.errors import UnknownCementType, UnknownConcreteType
+from beton.solver import capacity_matrix, max_volume, max_volumes
+from beton.table import MixTable
+
+STOCK = {"Çimento": 12000, "Su": 6000, "Kum": 40000, "Çakıl": 60000}
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(solver, "np", None)
+    return request.param
+
+
+@pytest.fixture
+def sparse_table():
+    # C20 has no CEM 2 mix; C30/CEM 2 is a mix that uses no Kum at all, and
+    # C30/CEM 1 uses nothing.
+    return MixTable.from_dict({
+        "C20": {MIX_KEY: {"CEM 1": {"Çimento": 300, "Kum": 700}}},
+        "C30": {MIX_KEY: {"CEM 1": {"Çimento": 0, "Kum": 0}, "CEM 2": {"Çimento": 400, "Kum": 0}}},
+    })
+
+
+def test_max_volume_matches_brute_force():
+    table = engine.builtin_table()
+    for concrete in table.concrete_types:
+        for cement in table.cements_for(concrete):
+            limits = {name: STOCK[name] / kg for name, kg in table.scale(concrete, cement, 1).items() if kg}
+            capacity = max_volume(concrete, cement, STOCK, table)
+            assert capacity.volume == min(limits.values())
+            assert capacity.bottleneck == min(limits, key=limits.get)
+
+
+def test_max_volumes_match_max_volume(backend):
+    table = engine.builtin_table()
+    capacities = max_volumes(STOCK, table)
+    assert len(capacities) == sum(len(table.cements_for(concrete)) for concrete in table.concrete_types)
+    for capacity in capacities:
+        single = max_volume(capacity.concrete_type, capacity.cement_type, STOCK, table)
+        assert capacity.volume == pytest.approx(single.volume)
+        assert capacity.bottleneck == single.bottleneck
+
+
+def test_missing_stock_counts_as_none(backend):
+    table = engine.builtin_table()
+    stock = dict(STOCK, Su=0)
+    del stock["Çakıl"]
+    assert {capacity.volume for capacity in max_volumes(stock, table)} == {0.0}
+    assert max_volume("C30", "CEM 1", stock, table).volume == 0.0
+
+
+def test_capacity_matrix_marks_missing_and_unlimited_mixes(backend, sparse_table):
+    volumes, bottlenecks = capacity_matrix({"Çimento": 1200, "Kum": 1400}, sparse_table)
+    volumes = [[float(volume) for volume in row] for row in volumes]
+    assert volumes[0][0] == 2.0 and int(bottlenecks[0][0]) == 1
+    assert math.isnan(volumes[0][1])
+    assert volumes[1] == [math.inf, 3.0]
+    assert int(bottlenecks[1][1]) == 0
+
+
+def test_unlimited_mix_has_no_bottleneck(backend, sparse_table):
+    capacities = {
+        (capacity.concrete_type, capacity.cement_type): capacity
+        for capacity in max_volumes({"Çimento": 1200}, sparse_table)
+    }
+    assert set(capacities) == {("C20", "CEM 1"), ("C30", "CEM 1"), ("C30", "CEM 2")}
+    assert capacities["C30", "CEM 1"].volume == math.inf
+    assert capacities["C30", "CEM 1"].bottleneck is None
+    assert max_volume("C30", "CEM 1", {}, sparse_table).bottleneck is None
+
+
+def test_unlimited_stock(backend):
+    table = engine.builtin_table()
+    stock = dict.fromkeys(table.ingredients, math.inf)
+    assert all(capacity.volume == math.inf for capacity in max_volumes(stock, table))
+    assert max_volume("C30", "CEM 1", stock, table).volume == math.inf
+
+
+@pytest.mark.parametrize("concrete, cement, error", [
+    ("C99", "CEM 1", UnknownConcreteType),
+    ("C30", "CEM 9", UnknownCementType),
+])
+def test_unknown_mix(concrete, cement, error):
+    with pytest.raises(error):
+        max_volume(concrete, cement, STOCK, engine.builtin_table())
+
+
+@pytest.mark.parametrize("stock, message", [
+    ({"Kireç": 1}, "unknown ingredients: Kireç"),
+    ({"Su": -1}, "must be non-negative"),
+    ({"Su": math.nan}, "must be non-negative"),
+])
+def test_invalid_stock(backend, stock, message):
+    with pytest.raises(ValueError, match=message):
+        capacity_matrix(stock, engine.builtin_table())
+    with pytest.raises(ValueError, match=message):
+        max_volume("C30", "CEM 1", stock, engine.builtin_table())
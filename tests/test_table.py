@@ -0,0 +1,58 @@
+import math
+
+import pytest
+
+from beton import MIX_KEY, beton_karisimlari
+from beton import table as table_module
+from beton.engine import builtin_table
+from beton.errors import UnknownCementType, UnknownConcreteType
+from beton.table import MixTable, ingredient_vector
+
+
+def test_scale_matches_nested_table():
+    table = builtin_table()
+    for concrete, entry in beton_karisimlari.items():
+        for cement, mix in entry[MIX_KEY].items():
+            expected = {ingredient: 2.5 * quantity for ingredient, quantity in mix.items()}
+            assert table.scale(concrete, cement, 2.5) == expected
+            assert table.row(concrete, cement).scaled(2.5) == expected
+            assert table.row(concrete, cement).amounts == tuple(mix.values())
+
+
+@pytest.mark.parametrize("concrete, cement, error", [
+    ("C99", "CEM 1", UnknownConcreteType),
+    ("C30", "CEM 9", UnknownCementType),
+    ("C30", "", UnknownCementType),
+])
+def test_unknown_mix(concrete, cement, error):
+    table = builtin_table()
+    with pytest.raises(error):
+        table.scale(concrete, cement, 1)
+    with pytest.raises(error):
+        table.row(concrete, cement)
+
+
+def test_row_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(table_module, "ROW_CACHE_SIZE", 2)
+    table = MixTable.from_dict(builtin_table().as_dict())
+    assert table._rows == {}
+    for concrete in ("C20", "C25", "C30"):
+        assert table.scale(concrete, "CEM 1", 1.0) == builtin_table().scale(concrete, "CEM 1", 1.0)
+    assert len(table._rows) <= 2
+
+
+@pytest.mark.parametrize("missing", [0.0, math.inf])
+def test_ingredient_vector_fills_missing(missing):
+    table = builtin_table()
+    vector = ingredient_vector(table, {"Su": 150}, "stock", missing=missing)
+    assert vector == [150.0 if name == "Su" else missing for name in table.ingredients]
+
+
+@pytest.mark.parametrize("quantities, error", [
+    ({"Kireç": 1}, "unknown ingredients: Kireç"),
+    ({"Su": -1}, "stock must be non-negative"),
+    ({"Su": math.nan}, "stock must be non-negative"),
+])
+def test_ingredient_vector_rejects(quantities, error):
+    with pytest.raises(ValueError, match=error):
+        ingredient_vector(builtin_table(), quantities, "stock", missing=0.0)
@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from beton.tasks import TaskScheduler
+
+
+class Posted:
+    """Stand-in for Clock.schedule_once: callbacks run when the test says so."""
+
+    def __init__(self):
+        self.callbacks = []
+        self._ready = threading.Condition()
+
+    def __call__(self, callback):
+        with self._ready:
+            self.callbacks.append(callback)
+            self._ready.notify_all()
+
+    def run(self, count):
+        """Wait until ``count`` callbacks were posted, then run them in order."""
+        with self._ready:
+            assert self._ready.wait_for(lambda: len(self.callbacks) >= count, timeout=5)
+            callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+@pytest.fixture
+def posted():
+    return Posted()
+
+
+@pytest.fixture
+def tasks(posted):
+    tasks = TaskScheduler(post=posted)
+    yield tasks
+    tasks.shutdown()
+
+
+def test_result_is_delivered_through_post(tasks, posted):
+    results = []
+    tasks.submit(pow, 2, 10, on_done=results.append)
+    assert results == []
+    posted.run(1)
+    assert results == [1024]
+
+
+def test_errors_go_to_on_error_or_the_log(tasks, posted, caplog):
+    errors = []
+    tasks.submit(int, "x", on_error=errors.append)
+    tasks.submit(int, "y")
+    posted.run(2)
+    assert [type(error) for error in errors] == [ValueError]
+    assert "Background task failed" in caplog.text
+
+
+def test_submitting_with_the_same_key_replaces_the_pending_task(tasks, posted):
+    started, release = threading.Event(), threading.Event()
+
+    def slow(value):
+        started.set()
+        release.wait(5)
+        return value
+
+    results = []
+    first = tasks.submit(slow, "first", key="calculation", on_done=results.append)
+    assert started.wait(5)
+    second = tasks.submit(str, "second", key="calculation", on_done=results.append)
+    release.set()
+    posted.run(1)
+    assert first.cancelled and not second.cancelled
+    assert results == ["second"]
+
+
+def test_cancel(tasks, posted):
+    release = threading.Event()
+    results = []
+    task = tasks.submit(release.wait, 5, key="calculation", on_done=results.append)
+    tasks.cancel("calculation")
+    tasks.cancel("calculation")  # already gone: nothing to do
+    release.set()
+    assert task.cancelled
+    tasks.submit(str, "after", on_done=results.append)
+    posted.run(1)
+    assert results == ["after"]
+
+
+def test_result_cancelled_after_it_finished_is_dropped(tasks, posted):
+    results = []
+    task = tasks.submit(str, "stale", key="calculation", on_done=results.append)
+    with posted._ready:
+        assert posted._ready.wait_for(lambda: posted.callbacks, timeout=5)
+    assert task.done()
+    tasks.cancel("calculation")
+    posted.run(1)
+    assert results == []
@@ -0,0 +1,91 @@
+import struct
+
+import pytest
+
+from beton import engine
+from beton.catalogue import Catalogue, write_catalogue
+from beton.watcher import CatalogueWatcher
+
+from test_catalogue import builtin_designs, edited_designs
+
+
+@pytest.fixture
+def watched(tmp_path):
+    path = str(tmp_path / "mixes.bin")
+    write_catalogue(path, builtin_designs())
+    changes = []
+    watcher = CatalogueWatcher(path, on_change=changes.append)
+    yield path, watcher, changes
+    engine.set_table(engine.builtin_table())
+
+
+def test_poll_reloads_changed_file(watched):
+    path, watcher, changes = watched
+    assert watcher.poll() is None
+    write_catalogue(path, edited_designs())
+    result = watcher.poll()
+    assert result.modified == {("C30", "CEM 1")}
+    assert result.removed == {("C20", "CEM 3")}
+    assert not result.rewritten
+    assert changes == [result]
+    assert engine.get_table() is watcher.catalogue
+    assert engine.calculate_mix("C30", "CEM 1", 1)["Su"] == 999.0
+
+
+def test_watching_and_reloading_do_not_decode_the_catalogue(watched):
+    path, watcher, changes = watched
+    assert watcher.catalogue._table is None
+    engine.cement_types("C40")
+    write_catalogue(path, edited_designs())
+    assert watcher.poll()
+    assert watcher.catalogue._table is None
+    # The cement list of an unchanged class is carried over, not reread
+    assert 7 in watcher.catalogue._cements_by_class
+
+
+def test_poll_waits_for_a_file_rewritten_in_place(watched):
+    path, watcher, changes = watched
+    data = open(path, "rb").read()
+    # Rewritten in place, as scp or adb push do, and cut short
+    with open(path, "wb") as f:
+        f.write(data[:len(data) // 2])
+    assert watcher.poll() is None
+    assert watcher.poll() is None
+    write_catalogue(path + ".new", edited_designs())
+    with open(path + ".new", "rb") as source, open(path, "wb") as f:
+        f.write(source.read())
+    result = watcher.poll()
+    assert result.rewritten and not result.classes_changed
+    assert (result.added, result.removed, result.modified) == (set(), set(), set())
+    assert changes == [result]
+    assert engine.get_table() is watcher.catalogue
+    assert engine.calculate_mix("C30", "CEM 1", 1)["Su"] == 999.0
+
+
+def test_poll_after_replacing_a_damaged_file(watched):
+    path, watcher, changes = watched
+    with open(path, "r+b") as f:
+        f.truncate(100)
+    assert watcher.poll() is None
+    # Replaced properly now, but the old mapping was damaged: no diff against it
+    write_catalogue(path, edited_designs())
+    assert watcher.poll().rewritten
+    assert engine.calculate_mix("C30", "CEM 1", 1)["Su"] == 999.0
+    write_catalogue(path, builtin_designs())
+    assert watcher.poll().modified == {("C30", "CEM 1")}
+
+
+def test_poll_skips_damaged_contents(watched, monkeypatch):
+    path, watcher, changes = watched
+    original = watcher.catalogue
+
+    def broken_diff(self, old):
+        raise struct.error("unpack requires a buffer")
+
+    monkeypatch.setattr(Catalogue, "diff", broken_diff)
+    write_catalogue(path, edited_designs())
+    assert watcher.poll() is None
+    assert watcher.catalogue is original
+    monkeypatch.undo()
+    assert watcher.poll().modified == {("C30", "CEM 1")}
+    assert changes